@@ -36,7 +36,7 @@ def get_question_answers(question_id):
     if not question:
         abort(404, description="Question not found")
 
-    answers = storage.filter_by(Answer, question_id=question_id)
+    answers = storage.iter_filter_by(Answer, question_id=question_id)
     return jsonify([a.to_dict() for a in answers]), 200
 
 
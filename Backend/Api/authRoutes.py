@@ -2,6 +2,7 @@
 
 from flask import Blueprint, request, jsonify, make_response
 from Utils.passwordSecurity import PasswordManager
+from Utils.inputSecurity import InputValidator
 from Utils.tokenSecurity import token_manager
 from Utils.authVerification import auth_required, admin_required
 from Persistence.DBStorage import storage
@@ -26,17 +27,30 @@ def login():
     if not email or not password:
         return jsonify({'error': 'Email et mot de passe requis'}), 400
 
-    users = storage.filter_by(User, email=email)
-    if not users:
+    # Entrées hors limites : rejet immédiat, sans requête ni bcrypt
+    if (not isinstance(email, str) or not isinstance(password, str)
+            or len(email) > InputValidator.MAX_EMAIL_LENGTH
+            or len(password) > InputValidator.MAX_PASSWORD_LENGTH):
         return jsonify({'error': 'Identifiants invalides'}), 401
 
-    user = users[0]
+    # Lookup sur l'index unique email (normalisé), comptes supprimés compris
+    user = storage.get_by_email(User, email, include_deleted=True)
+    if not user:
+        PasswordManager.dummy_verify(password)  # même latence qu'un mauvais mot de passe
+        return jsonify({'error': 'Identifiants invalides'}), 401
+
+    if not PasswordManager.verify_password(password, user.password):
+        return jsonify({'error': 'Identifiants invalides'}), 401
 
+    # Signalé seulement après vérification du mot de passe : un tiers ne
+    # peut pas savoir si un compte a été supprimé
     if user.is_deleted():
         return jsonify({'error': 'Compte supprimé'}), 401
 
-    if not PasswordManager.verify_password(password, user.password):
-        return jsonify({'error': 'Identifiants invalides'}), 401
+    # Mot de passe vérifié : on en profite pour aligner le hash sur le coût courant
+    if PasswordManager.needs_rehash(user.password):
+        user.password = PasswordManager.hash_password(password)
+        storage.save()
 
     # Générer access + refresh token
     access_token, refresh_token = token_manager.generate_tokens(
@@ -90,7 +104,7 @@ def refresh():
         return jsonify({'error': 'Utilisateur introuvable'}), 401
 
     # Générer un nouveau access token uniquement
-    new_access_token, _ = token_manager.generate_tokens(user_id, email)
+    new_access_token, _ = token_manager.generate_access_token(user_id, email)
 
     return jsonify({'access_token': new_access_token}), 200
 
@@ -118,7 +132,9 @@ def register():
         if field not in data:
             return jsonify({'error': f'Missing {field}'}), 400
 
-    if storage.filter_by(User, email=data['email']):
+    # Avant validate_and_create (qui hashe le mot de passe) ; email normalisé
+    # et comptes supprimés inclus, comme la contrainte unique
+    if storage.get_by_email(User, data['email'], include_deleted=True):
         return jsonify({'error': 'Email déjà utilisé'}), 409
 
     user, error = User.validate_and_create(
@@ -1,13 +1,13 @@
 """Session paths."""
 
 from flask import Blueprint, jsonify, request, abort
-import json
+import uuid
 from Models.sessionModel import Session
 from Models.userModel import User
 from Models.themeModel import Theme
 from Models.questionModel import Question
 from Models.answerModel import Answer
-from Utils.authVerification import auth_required, admin_required
+from Utils.authVerification import auth_required
 from Persistence.DBStorage import storage
 from Services.pdfAnalysisService import PDFAnalysisService
 from Services.similarityService import SimilarityService
@@ -26,7 +26,7 @@ def get_user_sessions(user_id):
     if not user:
         abort(404, description="User not found")
 
-    sessions = storage.filter_by(Session, user_id=user_id)
+    sessions = storage.iter_filter_by(Session, user_id=user_id)
     return jsonify([s.to_dict() for s in sessions]), 200
 
 
@@ -75,29 +75,19 @@ def create_session():
         if not theme:
             abort(404, description="Theme not found")
 
-    # Vérifier que le type est valide
-    allowed_types = ["QUIZ", "FLASHCARD"]
-    session_type = data["type"].upper()
-    if session_type not in allowed_types:
-        abort(400, description=f"Invalid session type: {data['type']}")
-
-    # Vérifier que questions_ids est une liste non vide
-    questions_ids = data["questions_ids"]
-    if not isinstance(questions_ids, list) or not questions_ids:
-        abort(400, description="questions_ids must be a non-empty list")
+    # Validation du type et de questions_ids (une seule fois, ici)
+    session, error = Session.validate_and_create(
+        user_id=data["user_id"],
+        session_type=data["type"],
+        questions_ids=data["questions_ids"],
+        theme_id=theme_id,
+        score=data.get("score"),
+        max_score=data.get("max_score")
+    )
+    if error:
+        abort(400, description=error)
 
     try:
-        # Création de la session
-        session = Session(
-            user_id=data["user_id"],
-            theme_id=theme_id,
-            type=session_type,
-            questions_ids=questions_ids,
-            questions_count=len(questions_ids),
-            score=data.get("score"),
-            max_score=data.get("max_score")
-        )
-
         storage.new(session)
         storage.save()
 
@@ -282,32 +272,33 @@ def create_session_with_pdf():
         # ********************************************************
         print("[DEBUG] 3. RECHERCHE THÈME EXISTANT")
 
-        # Récupérer tous les thèmes de l'utilisateur
-        user_themes = storage.filter_by(Theme, user_id=user_id)
-        print(f"[DEBUG]   - Thèmes utilisateur: {len(user_themes)}")
-
-        # Convertir en dict pour le service de similarité
-        themes_dict = [
-            {
-                'id': t.id,
-                'name': t.name,
-                'keywords': json.loads(t.keywords) if isinstance(t.keywords, str) else (t.keywords or []),
-                'description': t.description
-            }
-            for t in user_themes
-        ]
-        print(f"[DEBUG]   - themes_dict créé: {len(themes_dict)} thèmes")
-
-        # Chercher un thème correspondant (>= 40 %)
+        # Chercher un thème correspondant (>= 40 %), calculé en SQL via
+        # l'index theme_keywords : les thèmes de l'utilisateur ne sont pas chargés
         print(f"[DEBUG]   - Recherche similarité avec keywords: {theme_data.get('keywords', [])[:3]}...")
 
         matching_theme = None
-        
-        matching_theme = SimilarityService.find_matching_theme(
+
+        best_match = storage.find_best_theme_match(
             theme_data['keywords'],
-            themes_dict,
+            user_id,
             threshold=0.4
         )
+        if best_match:
+            best_theme, score = best_match
+            matching_theme = {
+                'theme': {'id': best_theme.id, 'name': best_theme.name},
+                'match_score': score
+            }
+        else:
+            # Sinon, un thème du même nom existe peut-être déjà (contrainte
+            # uq_user_theme_name, thèmes supprimés compris) : on le réutilise,
+            # restauré si besoin, au lieu d'échouer à l'INSERT
+            same_name = storage.find_theme_by_name(user_id, theme_data['theme_name'])
+            if same_name:
+                matching_theme = {
+                    'theme': {'id': same_name.id, 'name': same_name.name},
+                    'match_score': 1.0
+                }
 
         print(f"[DEBUG]   - Matching theme: {matching_theme is not None}")
 
@@ -400,6 +391,7 @@ def create_session_with_pdf():
 
                 print(f"[DEBUG]   - Nouvelles questions créées: {len(new_question_ids)}")
                 questions_ids.extend(new_question_ids)
+                theme.questions_count = (theme.questions_count or 0) + len(new_question_ids)
 
         else:
             print("[DEBUG]   ⚠️  Aucun thème similaire trouvé")
@@ -419,8 +411,10 @@ def create_session_with_pdf():
                 questions_count=0
             )
 
+            # flush (pas de commit) : l'ID est généré et le thème est visible
+            # par les INSERT des questions ; tout est validé avec la session
             storage.new(new_theme)
-            storage.save()
+            storage.flush()
 
             theme_id = new_theme.id
             print(f"[DEBUG]   - Thème créé avec ID: {theme_id}")
@@ -438,7 +432,6 @@ def create_session_with_pdf():
 
             # Mettre à jour le compteur
             new_theme.questions_count = len(questions_ids)
-            storage.save()
 
         print(f"[DEBUG]   ✅ Total questions pour session: {len(questions_ids)}\n")
 
@@ -459,6 +452,7 @@ def create_session_with_pdf():
             questions_count=len(questions_ids)
         )
 
+        # Un seul commit : thème, questions, réponses et session
         storage.new(session)
         storage.save()
 
@@ -517,8 +511,11 @@ def _create_questions_from_generated(
     theme_id: str,
     session_type: str
 ) -> list:
-    """Crée des objets Question et Answer depuis les questions générées par
-    Groq.
+    """Crée les questions et réponses générées par Groq.
+
+    Insertion en masse (une requête par table) au lieu d'un
+    new()/save() par question. Pas de commit ici : l'appelant valide
+    la transaction avec la session.
 
     Args:
         generated_questions: Questions générées par Groq.
@@ -535,63 +532,62 @@ def _create_questions_from_generated(
     print(f"[DEBUG]   - theme_id: {theme_id}")
     print(f"[DEBUG]   - session_type: {session_type}")
 
-    question_ids = []
-
-    for idx, q_data in enumerate(generated_questions):
-        print(f"\n[DEBUG]   Question {idx + 1}/{len(generated_questions)}:")
-        print(f"[DEBUG]     - Texte: {q_data.get('question', '')[:50]}...")
+    question_rows = []
+    answer_rows = []
+    # Traces de la boucle accumulées puis écrites en une fois
+    debug_lines = []
 
-        try:
-            # Créer la question
-            question = Question(
-                theme_id=theme_id,
-                type=QuestionType[session_type],
-                question_text=q_data['question'],
-                difficulty=Difficulty[q_data.get('difficulty', 'MEDIUM').upper()],
-            )
-
-            storage.new(question)
-            storage.save()
-
-            print(f"[DEBUG]     - Question créée ID: {question.id}")
+    try:
+        for idx, q_data in enumerate(generated_questions):
+            debug_lines.append(f"\n[DEBUG]   Question {idx + 1}/{len(generated_questions)}:")
+            debug_lines.append(f"[DEBUG]     - Texte: {q_data.get('question', '')[:50]}...")
+
+            # ID généré ici pour pouvoir lier les réponses sans attendre l'INSERT
+            question_id = str(uuid.uuid4())
+            question_rows.append({
+                'id': question_id,
+                'theme_id': theme_id,
+                'type': QuestionType[session_type],
+                'question_text': q_data['question'],
+                'difficulty': Difficulty[q_data.get('difficulty', 'MEDIUM').upper()],
+            })
 
             if session_type == 'QUIZ':
                 # QUIZ: 4 réponses
-                print(f"[DEBUG]     - Création {len(q_data.get('answers', []))} réponses QUIZ")
+                debug_lines.append(f"[DEBUG]     - Préparation {len(q_data.get('answers', []))} réponses QUIZ")
 
                 for ans_idx, ans_data in enumerate(q_data['answers']):
-                    answer = Answer(
-                        question_id=question.id,
-                        answer_text=ans_data['text'],
-                        is_correct=ans_data['is_correct'],
-                        order_position=ans_idx
-                    )
-                    storage.new(answer)
-                    print(f"[DEBUG] - Réponse {ans_idx + 1}: {ans_data['text'][:30]}... (correct={ans_data['is_correct']})")
+                    answer_rows.append({
+                        'question_id': question_id,
+                        'answer_text': ans_data['text'],
+                        'is_correct': ans_data['is_correct'],
+                        'order_position': ans_idx,
+                    })
             else:
                 # FLASHCARD: 1 réponse
-                print("[DEBUG]     - Création 1 réponse FLASHCARD")
-
-                answer = Answer(
-                    question_id=question.id,
-                    answer_text=q_data['answer'],
-                    is_correct=True,
-                    order_position=0
-                )
-                storage.new(answer)
-                print(f"[DEBUG]       - Réponse: {q_data['answer'][:30]}...")
-
-            storage.save()
-            question_ids.append(question.id)
-
-            print(f"[DEBUG]     ✅ Question {idx + 1} sauvegardée")
-
-        except Exception as e:
-            print(f"[ERROR]     ❌ Erreur création question {idx + 1}:")
-            print(f"[ERROR]     {type(e).__name__}: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            raise
+                debug_lines.append("[DEBUG]     - Préparation 1 réponse FLASHCARD")
+
+                answer_rows.append({
+                    'question_id': question_id,
+                    'answer_text': q_data['answer'],
+                    'is_correct': True,
+                    'order_position': 0,
+                })
+    finally:
+        # Écrites même si une question mal formée interrompt la boucle
+        if debug_lines:
+            print("\n".join(debug_lines))
+
+    # Un INSERT multi-lignes par table, dans la transaction de l'appelant
+    try:
+        question_ids = storage.bulk_insert(Question, question_rows)
+        storage.bulk_insert(Answer, answer_rows)
+    except Exception as e:
+        print("[ERROR]     ❌ Erreur insertion des questions:")
+        print(f"[ERROR]     {type(e).__name__}: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        raise
 
     print(f"\n[DEBUG]   ✅ Total questions créées: {len(question_ids)}")
     return question_ids
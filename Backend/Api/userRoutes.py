@@ -63,7 +63,8 @@ def create_user():
     if not is_valid:
         abort(400, description=error)
 
-    if storage.filter_by(User, email=data['email']):
+    # Inclut les comptes supprimés : la contrainte unique porte sur toute la table
+    if storage.get_by_email(User, data['email'], include_deleted=True):
         abort(400, description="Email already exists")
 
     hashed = PasswordManager.hash_password(data['password'])
@@ -72,7 +73,7 @@ def create_user():
         user = User(
             first_name=data['first_name'],
             last_name=data['last_name'],
-            email=data['email'],
+            email=InputValidator.normalize_email(data['email']),
             password=hashed,
             name=data['name']
         )
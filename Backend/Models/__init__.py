@@ -2,8 +2,9 @@
 
 from .userModel import User
 from .themeModel import Theme
+from .themeKeywordModel import ThemeKeyword
 from .questionModel import Question
 from .answerModel import Answer
 from .sessionModel import Session
 
-__all__ = ['User', 'Theme', 'Question', 'Answer', 'Session']
+__all__ = ['User', 'Theme', 'ThemeKeyword', 'Question', 'Answer', 'Session']
@@ -48,7 +48,8 @@ class Answer(BaseModel):
     # ********************************************************
 
     __table_args__ = (
-        Index('idx_answers_question', 'question_id'),
+        # Composite : filtre FK + soft delete en un seul parcours d'index
+        Index('idx_answers_question_deleted', 'question_id', 'deleted_at'),
         Index('idx_answers_correct', 'is_correct'),
     )
 
@@ -74,4 +75,4 @@ class Answer(BaseModel):
         """Retourne une représentation lisible de la réponse."""
         correct_symbol = "✓" if self.is_correct else "✗"
         text_preview = self.answer_text[:30] + '...' if len(self.answer_text) > 30 else self.answer_text
-        return f"<Answer(id={self.id[:8] if self.id else 'None'}, text='{text_preview}', correct={correct_symbol})>"
+        return f"<Answer(id={self.short_id}, text='{text_preview}', correct={correct_symbol})>"
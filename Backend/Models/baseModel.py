@@ -7,12 +7,17 @@ Fournit :
 - Héritage SQLAlchemy via Base
 """
 
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, inspect
+from sqlalchemy.orm import object_session, reconstructor
+from sqlalchemy.sql.elements import ClauseElement
 from Models.tablesSchema import Base
 from datetime import datetime
 from typing import Dict, Any
 import uuid
 
+# Lié une seule fois : appelé à chaque INSERT/UPDATE et à chaque mutation
+_utcnow = datetime.utcnow
+
 
 class BaseModel(Base):
     """Classe de base pour tous les modèles.
@@ -31,6 +36,7 @@ class BaseModel(Base):
         - soft_delete() : Suppression logique
         - is_deleted() : Vérifie si supprimé
         - update_timestamp() : Met à jour updated_at
+        - short_id : ID court (8 caractères) pour les représentations
     """
 
     __abstract__ = True  # Indique que BaseModel n'a pas de table propre
@@ -40,10 +46,33 @@ class BaseModel(Base):
     # ********************************************************
 
     id = Column(String(60), primary_key=True, default=lambda: str(uuid.uuid4()))
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=_utcnow, nullable=False)
+    updated_at = Column(DateTime, default=_utcnow, onupdate=_utcnow, nullable=False)
     deleted_at = Column(DateTime, nullable=True)
 
+    # ********************************************************
+    # CHARGEMENT DEPUIS LA BDD
+    # ********************************************************
+
+    @reconstructor
+    def _init_on_load(self) -> None:
+        """Précalcule l'ID court lors du chargement depuis la BDD."""
+        self._short_id = self.id[:8] if self.id else None
+
+    @property
+    def short_id(self) -> str:
+        """ID court (8 premiers caractères) utilisé par __repr__.
+
+        Calculé une seule fois : l'ID (clé primaire) ne change plus
+        après l'insertion.
+        """
+        short_id = self.__dict__.get('_short_id')
+        if short_id is None:
+            if not self.id:
+                return 'None'
+            short_id = self._short_id = self.id[:8]
+        return short_id
+
     # ********************************************************
     # MÉTHODES UTILITAIRES
     # ********************************************************
@@ -58,6 +87,7 @@ class BaseModel(Base):
             Dictionnaire contenant tous les attributs
         """
         data = {}
+        self._flush_pending_counters()
 
         # Parcourir toutes les colonnes de la table
         for column in self.__table__.columns:
@@ -86,8 +116,14 @@ class BaseModel(Base):
         Marque l'objet comme supprimé sans le retirer de la BDD. Permet
         de conserver l'historique et les relations.
         """
-        self.deleted_at = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
+        now = _utcnow()
+        self.deleted_at = now
+        self.updated_at = now
+
+    def restore(self) -> None:
+        """Annule un soft delete."""
+        self.deleted_at = None
+        self.updated_at = _utcnow()
 
     def is_deleted(self) -> bool:
         """Vérifie si l'objet est supprimé.
@@ -99,8 +135,39 @@ class BaseModel(Base):
 
     def update_timestamp(self) -> None:
         """Met à jour le timestamp de modification."""
-        self.updated_at = datetime.utcnow()
+        self.updated_at = _utcnow()
+
+    def _increment_counter(self, name: str, amount: int = 1) -> None:
+        """Incrémente un compteur entier.
+
+        Objet déjà en BDD : le flush écrit SET col = col + amount (delta
+        appliqué par la BDD, pas de mise à jour perdue entre requêtes
+        concurrentes) ; la valeur est relue au prochain accès.
+        Objet pas encore inséré : simple addition Python.
+        to_dict() flushe les compteurs en attente avant de les lire.
+        """
+        if not inspect(self).persistent:
+            setattr(self, name, (getattr(self, name) or 0) + amount)
+            return
+
+        # Plusieurs incréments avant le flush : on cumule l'expression
+        pending = self.__dict__.get(name)
+        base = pending if isinstance(pending, ClauseElement) else getattr(type(self), name)
+        setattr(self, name, base + amount)
+
+    def _flush_pending_counters(self) -> None:
+        """Résout les compteurs en attente avant une lecture en Python.
+
+        Après _increment_counter sur un objet persistant, l'attribut
+        contient l'expression SQL (col + amount) jusqu'au flush : on
+        flushe la session pour que l'accès suivant relise la valeur
+        entière. Sans effet s'il n'y a aucun incrément en attente.
+        """
+        if any(isinstance(value, ClauseElement) for value in self.__dict__.values()):
+            session = object_session(self)
+            if session is not None:
+                session.flush()
 
     def __repr__(self) -> str:
         """Représentation en chaîne de caractères."""
-        return f"<{self.__class__.__name__}(id={self.id[:8] if self.id else 'None'})>"
+        return f"<{type(self).__name__}(id={self.short_id})>"
@@ -62,7 +62,13 @@ class Question(BaseModel):
     # ********************************************************
 
     __table_args__ = (
-        Index('idx_questions_theme', 'theme_id'),
+        # Composite : filtre FK + soft delete (+ type pour le tirage des
+        # sessions) en un seul parcours d'index ; id inclus sous PostgreSQL
+        # pour que le tirage des IDs soit un index-only scan
+        Index(
+            'idx_questions_theme_deleted_type', 'theme_id', 'deleted_at', 'type',
+            postgresql_include=['id']
+        ),
         Index('idx_questions_type', 'type'),
         Index('idx_questions_difficulty', 'difficulty'),
     )
@@ -93,6 +99,7 @@ class Question(BaseModel):
         Returns:
             Taux de réussite en pourcentage (0-100)
         """
+        self._flush_pending_counters()
         if self.times_used == 0:
             return 0.0
         return (self.times_correct / self.times_used) * 100
@@ -103,9 +110,9 @@ class Question(BaseModel):
         Args:
             is_correct: La réponse était-elle correcte ?
         """
-        self.times_used += 1
+        self._increment_counter('times_used')
         if is_correct:
-            self.times_correct += 1
+            self._increment_counter('times_correct')
         self.update_timestamp()
 
     # ********************************************************
@@ -115,4 +122,4 @@ class Question(BaseModel):
     def __repr__(self) -> str:
         """Retourne une représentation lisible de la question."""
         text_preview = self.question_text[:50] + '...' if len(self.question_text) > 50 else self.question_text
-        return f"<Question(id={self.id[:8] if self.id else 'None'}, type={self.type.value if self.type else 'None'}, text='{text_preview}')>"
+        return f"<Question(id={self.short_id}, type={getattr(self.type, 'value', None)}, text='{text_preview}')>"
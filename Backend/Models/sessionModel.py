@@ -7,11 +7,13 @@ Hérite de BaseModel et ajoute :
 - Relations SQLAlchemy
 """
 
-from sqlalchemy import Column, String, Integer, JSON, ForeignKey, Enum as SQLEnum, Index
-from sqlalchemy.orm import relationship
-from Models.baseModel import BaseModel
+from sqlalchemy import Column, String, Integer, JSON, ForeignKey, Enum as SQLEnum, Index, all_, func, inspect, literal, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.mutable import MutableList
+from sqlalchemy.orm import relationship, object_session
+from Models.baseModel import BaseModel, _utcnow
 from Models.tablesSchema import SessionType
-from datetime import datetime
+from typing import Any, List, Optional, Tuple
 
 
 class Session(BaseModel):
@@ -24,7 +26,7 @@ class Session(BaseModel):
         - theme_id : ID du thème (FK)
         - type : QUIZ ou FLASHCARD (Enum)
         - questions_count : Nombre de questions
-        - questions_ids : Liste des IDs de questions (JSON)
+        - questions_ids : Liste des IDs de questions (ARRAY sous PostgreSQL, JSON sinon)
         - score : Score obtenu
         - max_score : Score maximum
         - started_at : Date/heure de début
@@ -47,14 +49,20 @@ class Session(BaseModel):
 
     # Configuration
     questions_count = Column(Integer, nullable=False)
-    questions_ids = Column(JSON, nullable=False, default=list)
+    # ARRAY natif sous PostgreSQL (append sans réécrire tout le JSON),
+    # MutableList pour que les append soient détectés par SQLAlchemy
+    questions_ids = Column(
+        MutableList.as_mutable(JSON().with_variant(ARRAY(String(60)), 'postgresql')),
+        nullable=False,
+        default=list
+    )
 
     # Résultats
     score = Column(Integer, nullable=True)
     max_score = Column(Integer, nullable=True)
 
     # Timestamps spécifiques
-    started_at = Column(String, default=datetime.utcnow, nullable=False)
+    started_at = Column(String, default=_utcnow, nullable=False)
     completed_at = Column(String, nullable=True)
 
     # ********************************************************
@@ -69,12 +77,58 @@ class Session(BaseModel):
     # ********************************************************
 
     __table_args__ = (
-        Index('idx_sessions_user', 'user_id'),
+        # Composite : filtre FK + soft delete en un seul parcours d'index
+        Index('idx_sessions_user_deleted', 'user_id', 'deleted_at'),
         Index('idx_sessions_theme', 'theme_id'),
         Index('idx_sessions_type', 'type'),
         Index('idx_sessions_completed', 'completed_at'),
     )
 
+    # ********************************************************
+    # VALIDATION (FRONTIÈRE API)
+    # ********************************************************
+
+    @classmethod
+    def validate_and_create(
+        cls,
+        user_id: str,
+        session_type: str,
+        questions_ids: List[str],
+        **kwargs: Any
+    ) -> Tuple[Optional['Session'], Optional[str]]:
+        """Valide des données non fiables et crée une session.
+
+        À appeler une seule fois, à la frontière de l'API. Le constructeur
+        ORM (utilisé aussi lors du chargement depuis la BDD) ne revalide
+        rien.
+
+        Args:
+            user_id: ID de l'utilisateur
+            session_type: 'QUIZ' ou 'FLASHCARD' (insensible à la casse)
+            questions_ids: Liste non vide d'IDs de questions
+            **kwargs: Autres colonnes (theme_id, score, max_score...)
+
+        Returns:
+            Tuple (Session créée, message d'erreur)
+        """
+        try:
+            s_type = SessionType[str(session_type).upper()]
+        except KeyError:
+            return None, f"Invalid session type: {session_type}"
+
+        if not isinstance(questions_ids, list) or not questions_ids:
+            return None, "questions_ids must be a non-empty list"
+
+        session = cls(
+            user_id=user_id,
+            type=s_type,
+            questions_ids=questions_ids,
+            questions_count=len(questions_ids),
+            **kwargs
+        )
+
+        return session, None
+
     # ********************************************************
     # LOGIQUE MÉTIER - SESSION MANAGEMENT
     # ********************************************************
@@ -86,7 +140,7 @@ class Session(BaseModel):
             score: Score obtenu
             max_score: Score maximum possible
         """
-        self.completed_at = datetime.utcnow()
+        self.completed_at = _utcnow()
         self.score = score
         self.max_score = max_score
         self.update_timestamp()
@@ -126,9 +180,33 @@ class Session(BaseModel):
     def add_question_id(self, question_id: str) -> None:
         """Ajoute un ID de question à la session.
 
+        Sous PostgreSQL, pour une session déjà en base, l'ajout est fait
+        côté serveur par un UPDATE atomique (array_append) : pas de
+        lecture-modification-écriture ni de réécriture de toute la liste,
+        et pas de doublon même avec des écritures concurrentes.
+
         Args:
             question_id: ID de la question
         """
+        db_session = object_session(self)
+        if (db_session is not None
+                and inspect(self).persistent
+                and db_session.get_bind().dialect.name == 'postgresql'):
+            cls = type(self)
+            db_session.execute(
+                update(cls)
+                .where(cls.id == self.id)
+                .where(literal(question_id) != all_(cls.questions_ids))
+                .values(
+                    questions_ids=func.array_append(cls.questions_ids, question_id),
+                    updated_at=_utcnow()
+                )
+                .execution_options(synchronize_session=False)
+            )
+            # Recharger la liste à la prochaine lecture
+            db_session.expire(self, ['questions_ids', 'updated_at'])
+            return
+
         if question_id not in self.questions_ids:
             self.questions_ids.append(question_id)
             self.update_timestamp()
@@ -141,4 +219,4 @@ class Session(BaseModel):
         """Retourne une représentation lisible de la session."""
         status = "completed" if self.is_completed() else "in_progress"
         score_str = f"{self.score}/{self.max_score}" if self.score is not None else "N/A"
-        return f"<Session(id={self.id[:8] if self.id else 'None'}, type={self.type.value if self.type else 'None'}, score={score_str}, status={status})>"
+        return f"<Session(id={self.short_id}, type={getattr(self.type, 'value', None)}, score={score_str}, status={status})>"
@@ -0,0 +1,73 @@
+"""
+ThemeKeyword Model - Index dénormalisé des mots-clés d'un thème
+
+Table de lecture (theme_id, keyword) qui permet de faire le matching
+par mots-clés directement en SQL (IN + GROUP BY + HAVING) au lieu de
+charger tous les thèmes en Python.
+
+La colonne JSON Theme.keywords reste la source de vérité : cette table
+est maintenue automatiquement par des listeners SQLAlchemy.
+"""
+
+from sqlalchemy import Column, String, ForeignKey, Index, event, inspect
+from Models.tablesSchema import Base
+from Models.themeModel import MAX_KEYWORD_LENGTH, Theme
+
+
+class ThemeKeyword(Base):
+    """Modèle ThemeKeyword.
+
+    Une ligne par mot-clé normalisé d'un thème.
+
+    Colonnes :
+        - theme_id : ID du thème (FK)
+        - keyword : Mot-clé normalisé (minuscules, sans espaces superflus)
+    """
+
+    __tablename__ = 'theme_keywords'
+
+    # ********************************************************
+    # COLONNES
+    # ********************************************************
+    theme_id = Column(String(60), ForeignKey('themes.id', ondelete='CASCADE'), primary_key=True)
+    keyword = Column(String(MAX_KEYWORD_LENGTH), primary_key=True)
+
+    # ********************************************************
+    # INDEX
+    # ********************************************************
+    __table_args__ = (
+        Index('idx_theme_keywords_keyword', 'keyword', 'theme_id'),
+    )
+
+    # ********************************************************
+    # REPRÉSENTATION
+    # ********************************************************
+    def __repr__(self) -> str:
+        """Retourne une représentation lisible du mot-clé."""
+        return f"<ThemeKeyword(theme_id={self.theme_id}, keyword={self.keyword})>"
+
+
+# ****************************************************************************
+# SYNCHRONISATION AVEC Theme.keywords
+# ****************************************************************************
+def _write_theme_keywords(connection, target: Theme) -> None:
+    """Remplace les lignes theme_keywords d'un thème par ses mots-clés."""
+    table = ThemeKeyword.__table__
+    connection.execute(table.delete().where(table.c.theme_id == target.id))
+
+    rows = [{'theme_id': target.id, 'keyword': k} for k in target.keyword_set]
+    if rows:
+        connection.execute(table.insert(), rows)
+
+
+@event.listens_for(Theme, 'after_insert')
+def _theme_keywords_after_insert(mapper, connection, target: Theme) -> None:
+    """Indexe les mots-clés d'un nouveau thème."""
+    _write_theme_keywords(connection, target)
+
+
+@event.listens_for(Theme, 'after_update')
+def _theme_keywords_after_update(mapper, connection, target: Theme) -> None:
+    """Réindexe les mots-clés uniquement s'ils ont changé."""
+    if inspect(target).attrs.keywords.history.has_changes():
+        _write_theme_keywords(connection, target)
@@ -7,10 +7,17 @@ Hérite de BaseModel et ajoute :
 - Relations SQLAlchemy
 """
 
-from sqlalchemy import Column, String, Text, JSON, Integer, ForeignKey, Index, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, DDL, String, Text, JSON, Integer, ForeignKey, Index, UniqueConstraint, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.mutable import MutableList
+from sqlalchemy.orm import relationship, reconstructor, validates
 from Models.baseModel import BaseModel
-from typing import List
+from typing import FrozenSet, Iterable, List
+import functools
+import sys
+
+# Longueur maximale d'un mot-clé normalisé (colonne theme_keywords.keyword)
+MAX_KEYWORD_LENGTH = 100
 
 
 class Theme(BaseModel):
@@ -22,7 +29,7 @@ class Theme(BaseModel):
         - user_id : ID du propriétaire (FK)
         - name : Nom du thème
         - description : Description
-        - keywords : Liste de mots-clés (JSON)
+        - keywords : Liste de mots-clés (JSONB sous PostgreSQL, JSON sinon)
         - questions_count : Nombre de questions
         - times_used : Popularité
 
@@ -40,7 +47,11 @@ class Theme(BaseModel):
     user_id = Column(String(60), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     name = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
-    keywords = Column(JSON, nullable=False, default=list)  # Liste de mots-clés
+    keywords = Column(
+        MutableList.as_mutable(JSON().with_variant(JSONB, 'postgresql')),
+        nullable=False,
+        default=list
+    )  # Liste de mots-clés
 
     # Statistiques
     questions_count = Column(Integer, default=0)
@@ -58,9 +69,81 @@ class Theme(BaseModel):
     # ********************************************************
     __table_args__ = (
         UniqueConstraint('user_id', 'name', name='uq_user_theme_name'),
-        Index('idx_themes_user', 'user_id'),
+        # Composite : filtre FK + soft delete en un seul parcours d'index,
+        # INCLUDE (PostgreSQL) pour des index-only scans sur les listes
+        Index(
+            'idx_themes_user_deleted', 'user_id', 'deleted_at',
+            postgresql_include=['name', 'questions_count']
+        ),
+        # GIN (PostgreSQL uniquement) : keywords @> '["python"]' via l'index
+        Index(
+            'idx_themes_keywords_gin', 'keywords',
+            postgresql_using='gin',
+            postgresql_ops={'keywords': 'jsonb_path_ops'}
+        ).ddl_if(dialect='postgresql'),
     )
 
+    # ********************************************************
+    # CACHE DES MOTS-CLÉS NORMALISÉS
+    # ********************************************************
+    @reconstructor
+    def _init_on_load(self) -> None:
+        """Précalcule le set de mots-clés normalisés au chargement."""
+        super()._init_on_load()
+        self._load_keyword_cache()
+
+    def _load_keyword_cache(self) -> FrozenSet[str]:
+        """Calcule le set de mots-clés normalisés et son masque de premières lettres."""
+        kw_set = self._kw_set = self.normalize_keywords(self.keywords or [])
+        self._kw_mask = self.first_char_mask(kw_set)
+        return kw_set
+
+    @validates('keywords')
+    def _invalidate_keywords_cache(self, key: str, value: List[str]) -> List[str]:
+        """Invalide le cache à chaque réaffectation de keywords."""
+        self._kw_set = None
+        return value
+
+    @staticmethod
+    def normalize_keywords(keywords: Iterable[str]) -> FrozenSet[str]:
+        """Normalise des mots-clés (minuscules, sans espaces superflus,
+        tronqués à MAX_KEYWORD_LENGTH caractères).
+
+        Les chaînes sont internées : un même mot-clé partagé par plusieurs
+        thèmes n'existe qu'une fois en mémoire, et les intersections de
+        sets se résolvent par comparaison d'identité.
+
+        Args:
+            keywords: Mots-clés bruts
+
+        Returns:
+            Set figé des mots-clés normalisés non vides
+        """
+        normalized = (k.lower().strip()[:MAX_KEYWORD_LENGTH].rstrip() for k in keywords)
+        return frozenset(sys.intern(k) for k in normalized if k)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def first_char_mask(keyword_set: FrozenSet[str]) -> int:
+        """Masque 64 bits des premières lettres d'un set de mots-clés.
+
+        Deux sets dont les masques ne partagent aucun bit n'ont aucun
+        mot-clé en commun : un AND d'entiers évite l'intersection.
+        Mis en cache : une même recherche est comparée à de nombreux thèmes.
+        """
+        mask = 0
+        for keyword in keyword_set:
+            mask |= 1 << (ord(keyword[0]) & 63)
+        return mask
+
+    @property
+    def keyword_set(self) -> FrozenSet[str]:
+        """Mots-clés normalisés du thème (calculés une seule fois)."""
+        kw_set = self.__dict__.get('_kw_set')
+        if kw_set is None:
+            kw_set = self._load_keyword_cache()
+        return kw_set
+
     # ********************************************************
     # LOGIQUE MÉTIER - KEYWORDS MATCHING
     # *******************************************************
@@ -84,18 +167,36 @@ class Theme(BaseModel):
         if not search_keywords or not self.keywords:
             return False
 
-        # Normaliser en minuscules
-        search_set = set(k.lower().strip() for k in search_keywords if k.strip())
-        theme_set = set(k.lower().strip() for k in self.keywords if k.strip())
+        return self.matches_keyword_set(self.normalize_keywords(search_keywords), threshold)
+
+    def matches_keyword_set(self, search_set: FrozenSet[str], threshold: float = 0.5) -> bool:
+        """Variante de matches_keywords avec des mots-clés déjà normalisés.
+
+        Pour comparer une même recherche à de nombreux thèmes : normaliser
+        une seule fois avec normalize_keywords() puis appeler cette méthode.
+
+        Args:
+            search_set: Mots-clés normalisés (voir normalize_keywords)
+            threshold: Pourcentage de correspondance minimum
 
+        Returns:
+            True si le seuil de correspondance est atteint
+        """
         if not search_set:
             return False
 
-        # Calculer l'intersection
-        matches = search_set & theme_set
+        theme_set = self.keyword_set
+
+        if threshold > 0:
+            # Rejets sans intersection : au plus len(theme_set) correspondances,
+            # et aucune si aucune première lettre n'est partagée
+            if len(theme_set) < threshold * len(search_set):
+                return False
+            if not self._kw_mask & self.first_char_mask(search_set):
+                return False
 
         # Calculer le ratio de correspondance
-        match_ratio = len(matches) / len(search_set)
+        match_ratio = len(search_set & theme_set) / len(search_set)
 
         return match_ratio >= threshold
 
@@ -108,6 +209,7 @@ class Theme(BaseModel):
         keyword = keyword.lower().strip()
         if keyword and keyword not in self.keywords:
             self.keywords.append(keyword)
+            self._kw_set = None
             self.update_timestamp()
 
     def remove_keyword(self, keyword: str) -> bool:
@@ -122,13 +224,14 @@ class Theme(BaseModel):
         keyword = keyword.lower().strip()
         if keyword in self.keywords:
             self.keywords.remove(keyword)
+            self._kw_set = None
             self.update_timestamp()
             return True
         return False
 
     def increment_usage(self) -> None:
-        """Incrémente le compteur d'utilisation."""
-        self.times_used += 1
+        """Incrémente le compteur d'utilisation (delta SQL au flush)."""
+        self._increment_counter('times_used')
         self.update_timestamp()
 
     # ********************************************************
@@ -136,4 +239,22 @@ class Theme(BaseModel):
     # ********************************************************
     def __repr__(self) -> str:
         """Retourne une représentation lisible du thème."""
-        return f"<Theme(id={self.id[:8] if self.id else 'None'}, name={self.name}, questions={self.questions_count})>"
+        return f"<Theme(id={self.short_id}, name={self.name}, questions={self.questions_count})>"
+
+
+# ****************************************************************************
+# RECHERCHE PLEIN TEXTE (POSTGRESQL UNIQUEMENT)
+# ****************************************************************************
+# Colonne tsvector générée (nom + description + mots-clés) et son index GIN.
+# Non mappée par l'ORM : interrogée via DBStorage.search_themes().
+event.listen(
+    Theme.__table__,
+    'after_create',
+    DDL(
+        "ALTER TABLE themes ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, '')) || "
+        "jsonb_to_tsvector('simple', coalesce(keywords, '[]'::jsonb), '[\"string\"]')"
+        ") STORED; "
+        "CREATE INDEX idx_themes_fts ON themes USING GIN (search_vector)"
+    ).execute_if(dialect='postgresql')
+)
@@ -7,9 +7,9 @@ Hérite de BaseModel et ajoute :
 - Relations SQLAlchemy
 """
 
-from sqlalchemy import Column, String, Boolean, Index
+from sqlalchemy import Column, String, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
-from Models.baseModel import BaseModel
+from Models.baseModel import BaseModel, _utcnow
 from Utils.inputSecurity import InputValidator
 from Utils.passwordSecurity import PasswordManager
 from typing import Optional, Tuple
@@ -41,7 +41,7 @@ class User(BaseModel):
     # ********************************************************
     first_name = Column(String(255), nullable=False)
     last_name = Column(String(255), nullable=False)
-    email = Column(String(255), unique=True, nullable=False, index=True)
+    email = Column(String(255), unique=True, nullable=False)  # UNIQUE = index de recherche
     password = Column(String(255), nullable=False)  # Hash bcrypt
     name = Column(String(100), nullable=True)
 
@@ -49,7 +49,7 @@ class User(BaseModel):
     is_verified = Column(Boolean, default=False, nullable=False)
     is_admin = Column(Boolean, default=False, nullable=False)
     verification_token = Column(String(255), nullable=True)
-    last_login_at = Column(String, nullable=True)
+    last_login_at = Column(DateTime, nullable=True)
 
     # ********************************************************
     # RELATIONS SQLALCHEMY
@@ -61,8 +61,7 @@ class User(BaseModel):
     # INDEX
     # ********************************************************
     __table_args__ = (
-        Index('idx_users_email', 'email'),
-        Index('idx_users_deleted', 'deleted_at'),
+        Index('idx_users_deleted_admin', 'deleted_at', 'is_admin'),
         Index('idx_users_admin', 'is_admin'),
     )
 
@@ -119,7 +118,7 @@ class User(BaseModel):
         user = User(
             first_name=first_name,
             last_name=last_name,
-            email=email.lower().strip(),
+            email=InputValidator.normalize_email(email),
             password=password_hash,
             name=name,
             is_verified=False,
@@ -141,8 +140,7 @@ class User(BaseModel):
 
     def update_last_login(self) -> None:
         """Met à jour la date de dernière connexion."""
-        from datetime import datetime
-        self.last_login_at = datetime.utcnow()
+        self.last_login_at = _utcnow()
         self.update_timestamp()
 
     # ********************************************************
@@ -150,4 +148,4 @@ class User(BaseModel):
     # ********************************************************
     def __repr__(self) -> str:
         """Retourne une représentation lisible de l'utilisateur."""
-        return f"<User(id={self.id[:8] if self.id else 'None'}, email={self.email})>"
+        return f"<User(id={self.short_id}, email={self.email})>"
@@ -8,20 +8,103 @@ SÉCURITÉ :
 - Validation des entrées
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import Float, case, cast, create_engine, event, exists, func, insert, inspect, lambda_stmt, select, text, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.session import make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+from collections import OrderedDict
 from contextlib import contextmanager
-from typing import Optional, List, Dict, Type, Any
+from typing import Optional, List, Dict, Tuple, Type, Any, Iterator
 from datetime import datetime
+import functools
 import os
+import threading
+import time
+import uuid
 
 # Import des modèles
 from Models.tablesSchema import Base
 from Models.userModel import User
 from Models.themeModel import Theme
+from Models.themeKeywordModel import ThemeKeyword
 from Models.questionModel import Question
 from Models.answerModel import Answer
 from Models.sessionModel import Session
+from Utils.inputSecurity import InputValidator
+
+
+class _TTLCache:
+    """Cache LRU borné avec expiration (TTL), thread-safe."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.__data = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key):
+        with self.__lock:
+            item = self.__data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self.__data[key]
+                return None
+            self.__data.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        with self.__lock:
+            self.__data[key] = (time.monotonic() + self.ttl, value)
+            self.__data.move_to_end(key)
+            if len(self.__data) > self.maxsize:
+                self.__data.popitem(last=False)
+
+    def pop(self, key) -> None:
+        with self.__lock:
+            self.__data.pop(key, None)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__data.clear()
+
+
+# Cache des User actifs (get / get_by_email) : chemin d'auth appelé à
+# chaque requête. Partagé par le processus, invalidé à chaque
+# modification d'un User ; le TTL borne l'écart entre processus.
+_user_cache = _TTLCache(maxsize=10000, ttl=30)
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _evict_user(mapper, connection, target: User) -> None:
+    """Invalide le cache d'un User modifié ou supprimé (ancien email inclus)."""
+    _user_cache.pop(('id', target.id))
+    emails = {target.email}
+    emails.update(inspect(target).attrs.email.history.deleted or ())
+    for email in emails:
+        if email:
+            _user_cache.pop(('email', InputValidator.normalize_email(email)))
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Réglages SQLite appliqués à chaque nouvelle connexion.
+
+    WAL + synchronous=NORMAL : un commit n'attend plus un fsync complet
+    et les lectures ne bloquent pas l'écriture. Tables temporaires en
+    mémoire et cache de pages de 64 Mo.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.close()
 
 
 class DBStorage:
@@ -50,11 +133,17 @@ class DBStorage:
         # Configuration selon le type de DB
         if database_url.startswith('sqlite'):
             # SQLite : check_same_thread=False pour Flask
+            # Base en mémoire : une seule connexion partagée (StaticPool),
+            # sinon chaque connexion du pool verrait une base vide différente
+            pool_args = {'poolclass': StaticPool} if ':memory:' in database_url else {}
             self.__engine = create_engine(
                 database_url,
                 echo=False,  # True en dev pour voir les requêtes SQL
-                connect_args={'check_same_thread': False}
+                connect_args={'check_same_thread': False},
+                query_cache_size=1200,  # Cache des requêtes SQL compilées
+                **pool_args
             )
+            event.listen(self.__engine, 'connect', _set_sqlite_pragmas)
         else:
             # PostgreSQL/MySQL
             self.__engine = create_engine(
@@ -62,7 +151,9 @@ class DBStorage:
                 echo=False,
                 pool_size=10,
                 max_overflow=20,
-                pool_pre_ping=True  # Vérifie connexion avant utilisation
+                pool_pre_ping=True,  # Vérifie connexion avant utilisation
+                pool_recycle=1800,  # Renouvelle avant les timeouts serveur/proxy
+                query_cache_size=1200  # Cache des requêtes SQL compilées
             )
 
         # Session factory thread-safe
@@ -72,6 +163,21 @@ class DBStorage:
         )
         self.__session = scoped_session(session_factory)
 
+        # create_all() déjà exécuté dans ce processus (voir init_schema)
+        self._schema_ready = False
+
+        # Dialecte utilisé pour choisir entre requêtes natives et fallback Python
+        self.dialect = self.__engine.dialect.name
+
+        # Capacités des classes calculées une fois (évite hasattr à chaque requête)
+        self.__soft_deletable = frozenset(
+            c for c in self.classes.values() if hasattr(c, 'deleted_at')
+        )
+        self.__has_email = frozenset(
+            c for c in self.classes.values() if hasattr(c, 'email')
+        )
+
+
     def all(self, cls: Type[Base] = None, include_deleted: bool = False) -> Dict[str, Any]:
         """Récupère tous les objets d'une classe.
 
@@ -93,17 +199,49 @@ class DBStorage:
             classes_to_query = self.classes.values()
 
         for class_type in classes_to_query:
-            query = self.__session.query(class_type)
+            # Nom de classe calculé une fois par classe, pas par objet
+            prefix = class_type.__name__ + '.'
+            objects.update(
+                (prefix + obj.id, obj)
+                for obj in self.iter_all(class_type, include_deleted)
+            )
 
-            # Filtre soft delete
-            if not include_deleted and hasattr(class_type, 'deleted_at'):
-                query = query.filter(class_type.deleted_at.is_(None))
+        return objects
 
-            for obj in query.all():
-                key = f"{obj.__class__.__name__}.{obj.id}"
-                objects[key] = obj
+    def iter_all(self, cls: Type[Base], include_deleted: bool = False,
+                 batch_size: int = 500) -> Iterator[Base]:
+        """Itère sur tous les objets d'une classe, par lots.
 
-        return objects
+        Les lignes sont chargées par lots de batch_size au lieu d'être
+        toutes matérialisées d'un coup.
+
+        Args:
+            cls: Classe à parcourir
+            include_deleted: Inclure objets soft-deleted
+            batch_size: Taille des lots chargés depuis la BDD
+
+        Exemple:
+            for user in storage.iter_all(User): ...
+        """
+        query = self.__session.query(cls)
+
+        # Filtre soft delete
+        if not include_deleted and cls in self.__soft_deletable:
+            query = query.filter(cls.deleted_at.is_(None))
+
+        yield from query.yield_per(batch_size)
+
+    def all_ids(self, cls: Type[Base], include_deleted: bool = False, **filters) -> List[str]:
+        """Récupère uniquement les IDs d'une classe (sans objets ORM).
+
+        Accepte les mêmes filtres d'égalité que filter_by.
+
+        Exemple:
+            storage.all_ids(Question)
+            storage.all_ids(Question, theme_id='xyz', type=QuestionType.QUIZ)
+        """
+        query = self.__filtered_query(cls, include_deleted, filters, cls.id)
+        return [row[0] for row in query]
 
     def new(self, obj: Base):
         """Ajoute un nouvel objet à la session.
@@ -113,6 +251,57 @@ class DBStorage:
         """
         self.__session.add(obj)
 
+    def bulk_insert(self, cls: Type[Base], rows: List[Dict[str, Any]]) -> List[str]:
+        """Insère plusieurs lignes en une seule requête (executemany).
+
+        Passe par l'INSERT Core de la table, sans unit-of-work ORM : à
+        réserver aux imports massifs (questions générées...). Les IDs sont
+        générés côté client, donc pas besoin de RETURNING. Aucun objet ORM
+        n'est créé ; appeler save() pour valider.
+
+        Args:
+            cls: Classe cible (Question, Answer...)
+            rows: Liste de dicts {colonne: valeur}, mêmes clés pour chaque ligne
+
+        Returns:
+            Liste des IDs insérés, dans l'ordre de rows
+
+        Exemple:
+            ids = storage.bulk_insert(Answer, [{'question_id': qid, 'answer_text': 'A'}])
+            storage.save()
+        """
+        if not rows:
+            return []
+
+        for row in rows:
+            if not row.get('id'):
+                row['id'] = str(uuid.uuid4())
+
+        self.__session.execute(insert(cls.__table__), rows)
+        return [row['id'] for row in rows]
+
+    def increment(self, cls: Type[Base], ids, **amounts: int) -> None:
+        """Incrémente des compteurs sur plusieurs lignes en une requête.
+
+        UPDATE ... SET col = col + n WHERE id IN (...) : l'addition est
+        faite par la BDD (pas de mise à jour perdue entre requêtes
+        concurrentes) et une seule instruction remplace une UPDATE par
+        objet. Les objets déjà chargés dans la session sont synchronisés.
+        Appeler save() pour valider.
+
+        Exemple:
+            storage.increment(Question, answered_ids, times_used=1)
+        """
+        ids = list(set(ids or []))
+        if not ids or not amounts:
+            return
+
+        values = {key: getattr(cls, key) + amount for key, amount in amounts.items()}
+        for start in range(0, len(ids), 1000):
+            self.__session.execute(
+                update(cls).where(cls.id.in_(ids[start:start + 1000])).values(**values)
+            )
+
     def save(self):
         """Commit les changements dans la base de données.
 
@@ -124,6 +313,14 @@ class DBStorage:
             self.__session.rollback()
             raise e
 
+    def flush(self):
+        """Envoie les changements en attente sans commit.
+
+        Utile pour obtenir les IDs générés (defaults de colonnes) et
+        rendre les lignes visibles aux INSERT Core de la même transaction.
+        """
+        self.__session.flush()
+
     def rollback(self):
         """Annule les changements non sauvegardés."""
         self.__session.rollback()
@@ -145,21 +342,69 @@ class DBStorage:
             self.__session.delete(obj)
         else:
             # Soft delete
-            if hasattr(obj, 'deleted_at'):
+            if type(obj) in self.__soft_deletable:
                 obj.deleted_at = datetime.utcnow()
                 self.__session.add(obj)
 
+    def init_schema(self):
+        """Crée les tables manquantes, une seule fois par processus.
+
+        create_all() interroge le catalogue pour chaque table : à appeler
+        une fois au démarrage de l'application, pas à chaque requête.
+        """
+        if not self._schema_ready:
+            Base.metadata.create_all(self.__engine)
+            self.__backfill_theme_keywords()
+            self._schema_ready = True
+
+    def __backfill_theme_keywords(self) -> None:
+        """Indexe dans theme_keywords les thèmes qui n'y ont aucune ligne.
+
+        Les thèmes créés avant la table theme_keywords (ou importés hors
+        ORM) ne sont pas vus par le matching SQL tant qu'ils n'y sont pas.
+        """
+        indexed = exists().where(ThemeKeyword.theme_id == Theme.id)
+        rows = [
+            {'theme_id': theme.id, 'keyword': keyword}
+            for theme in self.__session.query(Theme).filter(~indexed)
+            for keyword in theme.keyword_set
+        ]
+        if not rows:
+            self.__session.rollback()
+            return
+        try:
+            self.__session.execute(ThemeKeyword.__table__.insert(), rows)
+            self.__session.commit()
+        except IntegrityError:
+            # Un autre processus a fait le même rattrapage en parallèle
+            self.__session.rollback()
+
     def reload(self):
-        """Recharge la session depuis la base de données."""
-        Base.metadata.create_all(self.__engine)
-        self.__session = scoped_session(
-            sessionmaker(bind=self.__engine, expire_on_commit=False)
-        )
+        """Recharge la session depuis la base de données.
+
+        Le schéma n'est créé qu'au premier appel. Les objets de la session
+        sont ensuite expirés (relus en BDD au prochain accès) : la session
+        et sa connexion sont conservées, dispose() libère le pool si besoin.
+        """
+        self.init_schema()
+        self.__session.expire_all()
 
     def close(self):
         """Ferme la session."""
         self.__session.remove()
 
+    def dispose(self, close: bool = True):
+        """Libère le pool de connexions de l'engine.
+
+        Args:
+            close: False après un fork : abandonne les connexions héritées
+                du parent sans les fermer ni les rendre au pool (le retour
+                au pool ferait un ROLLBACK sur des sockets du parent)
+        """
+        if close:
+            self.__session.remove()
+        self.__engine.dispose(close=close)
+
     # ********************************************************
     # MÉTHODES DE RECHERCHE SÉCURISÉES
     # ********************************************************
@@ -178,12 +423,91 @@ class DBStorage:
         if not cls or not id:
             return None
 
-        query = self.__session.query(cls).filter(cls.id == id)
+        # Déjà chargé dans la session de la requête : pas de requête SQL
+        # (les lookups répétés d'un même thème/question dans une requête)
+        current = self.__session.identity_map.get(identity_key(cls, id))
+        if current is not None:
+            if include_deleted or cls not in self.__soft_deletable or current.deleted_at is None:
+                return current
+            return None
 
-        if not include_deleted and hasattr(cls, 'deleted_at'):
-            query = query.filter(cls.deleted_at.is_(None))
+        cache_key = None
+        if cls is User and not include_deleted:
+            cache_key = ('id', id)
+            cached = self.__from_cache(cache_key)
+            if cached is not None:
+                return cached
+
+        # lambda_stmt : construction + compilation mises en cache, seul
+        # le paramètre id est relié à chaque appel (chemin d'auth)
+        stmt = lambda_stmt(lambda: select(cls).where(cls.id == id))
+
+        if not include_deleted and cls in self.__soft_deletable:
+            stmt += lambda s: s.where(cls.deleted_at.is_(None))
+
+        stmt += lambda s: s.limit(1)
 
-        return query.first()
+        obj = self.__session.execute(stmt).scalars().first()
+        if cache_key and obj is not None:
+            self.__to_cache(cache_key, obj)
+        return obj
+
+    def bulk_get(self, cls: Type[Base], ids, include_deleted: bool = False) -> Dict[str, Base]:
+        """Récupère plusieurs objets par leurs IDs en une requête IN (...).
+
+        Remplace une boucle de get() (N requêtes) par une requête par lot
+        de 1000 IDs (limite de paramètres des SGBD).
+
+        Args:
+            cls: Classe du modèle
+            ids: IDs des objets (doublons ignorés)
+            include_deleted: Inclure objets supprimés
+
+        Returns:
+            Dict {id: objet} (les IDs introuvables sont absents)
+
+        Exemple:
+            storage.bulk_get(Question, session.questions_ids)
+        """
+        ids = list(set(ids or []))
+        objects = {}
+
+        for start in range(0, len(ids), 1000):
+            query = self.__session.query(cls).filter(cls.id.in_(ids[start:start + 1000]))
+
+            if not include_deleted and cls in self.__soft_deletable:
+                query = query.filter(cls.deleted_at.is_(None))
+
+            objects.update((obj.id, obj) for obj in query)
+
+        return objects
+
+    def filter_in(self, cls: Type[Base], key: str, values,
+                  include_deleted: bool = False, columns: Tuple[str, ...] = None,
+                  **filters) -> List[Any]:
+        """Récupère les objets dont l'attribut key est dans values.
+
+        Une requête IN (...) par lot de 1000 valeurs, au lieu d'un
+        filter_by par valeur. Accepte en plus les filtres d'égalité de
+        filter_by.
+
+        columns : noms de colonnes à renvoyer (tuples) à la place des
+        objets ORM, quand seules quelques valeurs sont lues.
+
+        Exemple:
+            storage.filter_in(Answer, 'question_id', session.questions_ids, is_correct=True)
+            storage.filter_in(Answer, 'question_id', ids, columns=('question_id', 'id'))
+        """
+        values = list(set(values or []))
+        column = getattr(cls, key)
+        entities = [getattr(cls, name) for name in columns or ()]
+        query = self.__filtered_query(cls, include_deleted, filters, *entities)
+        objects = []
+
+        for start in range(0, len(values), 1000):
+            objects.extend(query.filter(column.in_(values[start:start + 1000])))
+
+        return objects
 
     def get_by_email(self, cls: Type[Base], email: str, include_deleted: bool = False) -> Optional[Base]:
         """Récupère un objet par email (User principalement)
@@ -193,18 +517,57 @@ class DBStorage:
         if not cls or not email:
             return None
 
-        if not hasattr(cls, 'email'):
+        if cls not in self.__has_email:
             return None
 
         # Normalisation email
-        email = email.strip().lower()
+        email = InputValidator.normalize_email(email)
 
-        query = self.__session.query(cls).filter(cls.email == email)
+        cache_key = None
+        if cls is User and not include_deleted:
+            cache_key = ('email', email)
+            cached = self.__from_cache(cache_key)
+            if cached is not None:
+                return cached
 
-        if not include_deleted and hasattr(cls, 'deleted_at'):
-            query = query.filter(cls.deleted_at.is_(None))
+        stmt = lambda_stmt(lambda: select(cls).where(cls.email == email))
+
+        if not include_deleted and cls in self.__soft_deletable:
+            stmt += lambda s: s.where(cls.deleted_at.is_(None))
+
+        stmt += lambda s: s.limit(1)
+
+        obj = self.__session.execute(stmt).scalars().first()
+        if cache_key and obj is not None:
+            self.__to_cache(cache_key, obj)
+        return obj
+
+    def __to_cache(self, key, obj: Base) -> None:
+        """Met en cache une copie détachée des colonnes de obj.
+
+        On ne garde jamais l'instance de la session : elle appartient à un
+        thread et peut être modifiée par la requête en cours.
+        """
+        mapper = inspect(obj).mapper
+        snapshot = mapper.class_manager.new_instance()
+        for attr in mapper.column_attrs:
+            set_committed_value(snapshot, attr.key, getattr(obj, attr.key))
+        make_transient_to_detached(snapshot)
+        _user_cache.set(key, snapshot)
+
+    def __from_cache(self, key) -> Optional[Base]:
+        """Rattache à la session courante un objet en cache, sans requête SQL."""
+        snapshot = _user_cache.get(key)
+        if snapshot is None:
+            return None
+
+        # Déjà présent dans la session : on garde cette instance (et ses
+        # éventuelles modifications en cours)
+        current = self.__session.identity_map.get(identity_key(instance=snapshot))
+        if current is not None:
+            return current if current.deleted_at is None else None
 
-        return query.first()
+        return self.__session.merge(snapshot, load=False)
 
     def filter_by(self, cls: Type[Base], include_deleted: bool = False, **filters) -> List[Base]:
         """Filtre les objets selon critères.
@@ -220,18 +583,19 @@ class DBStorage:
         Exemple:
             storage.filter_by(Question, theme_id='xyz')
         """
-        query = self.__session.query(cls)
+        return self.__filtered_query(cls, include_deleted, filters).all()
 
-        # Applique les filtres
-        for key, value in filters.items():
-            if hasattr(cls, key):
-                query = query.filter(getattr(cls, key) == value)
+    def iter_filter_by(self, cls: Type[Base], include_deleted: bool = False,
+                       batch_size: int = 500, **filters) -> Iterator[Base]:
+        """Variante de filter_by qui itère par lots (yield_per).
 
-        # Filtre soft delete
-        if not include_deleted and hasattr(cls, 'deleted_at'):
-            query = query.filter(cls.deleted_at.is_(None))
+        Pour les appelants qui parcourent le résultat une seule fois :
+        évite de matérialiser toute la liste en mémoire.
 
-        return query.all()
+        Exemple:
+            for session in storage.iter_filter_by(Session, user_id='abc'): ...
+        """
+        yield from self.__filtered_query(cls, include_deleted, filters).yield_per(batch_size)
 
     def count(self, cls: Type[Base], include_deleted: bool = False, **filters) -> int:
         """Compte les objets selon critères.
@@ -240,16 +604,26 @@ class DBStorage:
             storage.count(User)  # Nombre total users
             storage.count(Question, theme_id='abc')  # Questions d'un thème
         """
-        query = self.__session.query(cls)
+        return self.__filtered_query(cls, include_deleted, filters).count()
+
+    def __filtered_query(self, cls: Type[Base], include_deleted: bool, filters: Dict[str, Any],
+                         *entities):
+        """Construit la requête commune à filter_by, iter_filter_by, count et all_ids.
+
+        entities : colonnes à sélectionner à la place des objets (ex: cls.id)
+        """
+        query = self.__session.query(*(entities or (cls,)))
 
+        # Applique les filtres
         for key, value in filters.items():
             if hasattr(cls, key):
                 query = query.filter(getattr(cls, key) == value)
 
-        if not include_deleted and hasattr(cls, 'deleted_at'):
+        # Filtre soft delete
+        if not include_deleted and cls in self.__soft_deletable:
             query = query.filter(cls.deleted_at.is_(None))
 
-        return query.count()
+        return query
 
     # ********************************************************
     # MÉTHODES SPÉCIFIQUES MÉTIER
@@ -271,16 +645,258 @@ class DBStorage:
         """Récupère toutes les sessions d'un utilisateur."""
         return self.filter_by(Session, user_id=user_id)
 
+    def find_themes_by_keywords(
+        self,
+        search_keywords: List[str],
+        threshold: float = 0.5,
+        user_id: Optional[str] = None
+    ) -> List[Theme]:
+        """Trouve les thèmes correspondant à des mots-clés, côté SQL.
+
+        Même critère que Theme.matches_keywords (mots-clés trouvés /
+        mots-clés recherchés >= threshold), calculé via l'index
+        theme_keywords au lieu de charger tous les thèmes.
+
+        Args:
+            search_keywords: Mots-clés recherchés
+            threshold: Pourcentage de correspondance minimum
+            user_id: Restreindre aux thèmes d'un utilisateur
+
+        Returns:
+            Liste de thèmes triés par nombre de correspondances décroissant
+
+        Exemple:
+            storage.find_themes_by_keywords(['python', 'flask'], 0.5, user_id)
+        """
+        search_set = Theme.normalize_keywords(search_keywords or [])
+        if not search_set:
+            return []
+
+        matches = func.count(ThemeKeyword.keyword)
+        query = (
+            self.__session.query(Theme)
+            .join(ThemeKeyword, ThemeKeyword.theme_id == Theme.id)
+            .filter(ThemeKeyword.keyword.in_(search_set))
+            .filter(Theme.deleted_at.is_(None))
+        )
+        if user_id:
+            query = query.filter(Theme.user_id == user_id)
+
+        return (
+            query.group_by(Theme.id)
+            .having(matches >= threshold * len(search_set))
+            .order_by(matches.desc())
+            .all()
+        )
+
+    def find_best_theme_match(
+        self,
+        search_keywords: List[str],
+        user_id: str,
+        threshold: float = 0.4
+    ) -> Optional[Tuple[Theme, float]]:
+        """Meilleur thème d'un utilisateur par chevauchement de mots-clés, côté SQL.
+
+        Même score que SimilarityService.keyword_set_overlap : mots-clés
+        communs / taille du plus petit des deux sets. Les correspondances
+        viennent de l'index theme_keywords ; aucun thème non candidat
+        n'est chargé ni agrégé. À score égal, le plus ancien l'emporte.
+
+        Args:
+            search_keywords: Mots-clés recherchés (ex. extraits d'un PDF)
+            user_id: Propriétaire des thèmes
+            threshold: Score minimum (0.4 = 40 %)
+
+        Returns:
+            Tuple (thème, score) du meilleur candidat, ou None
+
+        Exemple:
+            match = storage.find_best_theme_match(['python', 'flask'], user_id)
+        """
+        search_set = Theme.normalize_keywords(search_keywords or [])
+        if not search_set:
+            return None
+
+        # Nombre total de mots-clés de chaque thème candidat (dénominateur) :
+        # l'agrégat ne parcourt que les thèmes ayant au moins un mot-clé commun
+        candidates = select(ThemeKeyword.theme_id).where(ThemeKeyword.keyword.in_(search_set))
+        totals = (
+            select(ThemeKeyword.theme_id, func.count().label('total'))
+            .where(ThemeKeyword.theme_id.in_(candidates))
+            .group_by(ThemeKeyword.theme_id)
+            .subquery()
+        )
+        min_size = case(
+            (totals.c.total < len(search_set), totals.c.total),
+            else_=len(search_set)
+        )
+        score = cast(func.count(ThemeKeyword.keyword), Float) / min_size
+
+        row = (
+            self.__session.query(Theme, score)
+            .join(ThemeKeyword, ThemeKeyword.theme_id == Theme.id)
+            .join(totals, totals.c.theme_id == Theme.id)
+            .filter(ThemeKeyword.keyword.in_(search_set))
+            .filter(Theme.user_id == user_id)
+            .filter(Theme.deleted_at.is_(None))
+            .group_by(Theme.id, totals.c.total)
+            .having(score >= threshold)
+            # À score égal, le thème le plus ancien (comme find_matching_theme)
+            .order_by(score.desc(), Theme.created_at, Theme.id)
+            .first()
+        )
+        return (row[0], row[1]) if row else None
+
+    def find_theme_by_name(self, user_id: str, name: str) -> Optional[Theme]:
+        """Thème d'un utilisateur portant ce nom, restauré s'il était supprimé.
+
+        La contrainte uq_user_theme_name couvre aussi les thèmes
+        soft-deleted : un INSERT du même nom échouerait. Le thème existant
+        est donc réutilisé ; s'il était supprimé, il est restauré avec ses
+        compteurs et ses questions (validé au prochain save()).
+
+        Args:
+            user_id: Propriétaire du thème
+            name: Nom exact du thème
+
+        Returns:
+            Thème (actif) ou None
+        """
+        theme = self.__filtered_query(Theme, True, {'user_id': user_id, 'name': name}).first()
+        if theme is not None and theme.is_deleted():
+            theme.restore()
+        return theme
+
+    def find_themes_containing(self, keywords: List[str], user_id: Optional[str] = None) -> List[Theme]:
+        """Trouve les thèmes dont les mots-clés contiennent TOUS ceux donnés.
+
+        PostgreSQL : opérateur JSONB @> (index GIN idx_themes_keywords_gin).
+        Autres bases : filtre en Python sur les thèmes chargés.
+
+        Args:
+            keywords: Mots-clés qui doivent tous être présents
+            user_id: Restreindre aux thèmes d'un utilisateur
+
+        Returns:
+            Liste de thèmes
+        """
+        if not keywords:
+            return []
+
+        if self.dialect != 'postgresql':
+            themes = self.filter_by(Theme, user_id=user_id) if user_id else list(self.all(Theme).values())
+            return [t for t in themes if all(k in (t.keywords or []) for k in keywords)]
+
+        query = self.__session.query(Theme).filter(
+            Theme.keywords.op('@>')(cast(keywords, JSONB)),
+            Theme.deleted_at.is_(None)
+        )
+        if user_id:
+            query = query.filter(Theme.user_id == user_id)
+
+        return query.all()
+
+    def search_themes(self, terms: List[str], user_id: Optional[str] = None) -> List[Theme]:
+        """Recherche plein texte des thèmes (nom, description, mots-clés).
+
+        PostgreSQL : colonne search_vector (tsvector + index GIN), un seul
+        terme suffit (OU). Autres bases : recherche en Python.
+
+        Args:
+            terms: Termes recherchés
+            user_id: Restreindre aux thèmes d'un utilisateur
+
+        Returns:
+            Liste de thèmes contenant au moins un des termes
+        """
+        terms = [t.strip() for t in terms or [] if t and t.strip()]
+        if not terms:
+            return []
+
+        if self.dialect != 'postgresql':
+            wanted = Theme.normalize_keywords(terms)
+            themes = self.filter_by(Theme, user_id=user_id) if user_id else list(self.all(Theme).values())
+            return [
+                t for t in themes
+                if wanted & t.keyword_set
+                or any(w in f"{t.name} {t.description or ''}".lower() for w in wanted)
+            ]
+
+        query = self.__session.query(Theme).filter(
+            text("themes.search_vector @@ websearch_to_tsquery('simple', :q)"),
+            Theme.deleted_at.is_(None)
+        ).params(q=' or '.join(terms))
+        if user_id:
+            query = query.filter(Theme.user_id == user_id)
+
+        return query.all()
+
+    def reindex_theme_keywords(self) -> None:
+        """Reconstruit entièrement la table theme_keywords.
+
+        À lancer une fois sur une base existante (les nouveaux thèmes
+        sont indexés automatiquement).
+        """
+        self.__session.query(ThemeKeyword).delete(synchronize_session=False)
+        rows = [
+            {'theme_id': theme.id, 'keyword': keyword}
+            for theme in self.__session.query(Theme)
+            for keyword in theme.keyword_set
+        ]
+        if rows:
+            self.__session.execute(ThemeKeyword.__table__.insert(), rows)
+        self.save()
+
     def get_user_stats(self, user_id: str) -> Dict[str, int]:
         """Retourne les statistiques d'un utilisateur.
 
+        Les trois compteurs sont calculés par des sous-requêtes scalaires
+        dans un seul SELECT : un aller-retour BDD au lieu de trois.
+
         Returns:
             Dict contenant le nombre de thèmes, questions et sessions.
         """
+        def _count(cls, *criteria):
+            return (
+                select(func.count())
+                .select_from(cls)
+                .where(cls.deleted_at.is_(None), *criteria)
+                .scalar_subquery()
+            )
+
+        row = self.__session.execute(select(
+            _count(Theme, Theme.user_id == user_id).label('total_themes'),
+            _count(Question).label('total_questions'),
+            _count(Session, Session.user_id == user_id).label('total_sessions'),
+        )).one()
+        return dict(row._mapping)
+
+    def get_session_stats(self, user_id: str) -> Dict[Any, Dict[str, float]]:
+        """Agrège les sessions terminées d'un utilisateur, par type.
+
+        Un seul GROUP BY en SQL (index user_id, deleted_at) au lieu de
+        charger toutes les sessions et de les parcourir en Python.
+
+        Returns:
+            Dict {SessionType: {'count': n, 'success_rate_sum': somme des
+            taux de réussite en %}} ; les types sans session sont absents
+        """
+        success_rate = case(
+            (Session.max_score > 0, Session.score * 100.0 / Session.max_score),
+            else_=0.0,
+        )
+        rows = self.__session.execute(
+            select(Session.type, func.count(), func.coalesce(func.sum(success_rate), 0.0))
+            .where(
+                Session.user_id == user_id,
+                Session.deleted_at.is_(None),
+                Session.completed_at.is_not(None),
+            )
+            .group_by(Session.type)
+        )
         return {
-            'total_themes': self.count(Theme, user_id=user_id),
-            'total_questions': self.count(Question),
-            'total_sessions': self.count(Session, user_id=user_id),
+            session_type: {'count': count, 'success_rate_sum': float(rate_sum)}
+            for session_type, count, rate_sum in rows
         }
 
     # ********************************************************
@@ -307,9 +923,71 @@ class DBStorage:
         finally:
             self.__session.close()
 
+    @contextmanager
+    def count_queries(self) -> Iterator[List[str]]:
+        """Context manager de diagnostic : liste les requêtes SQL exécutées.
+
+        Seules les requêtes du thread courant sont comptées. Utile pour
+        vérifier qu'un chemin ne dégénère pas en N+1.
+
+        Usage:
+            with storage.count_queries() as queries:
+                storage.bulk_get(Question, ids)
+            assert len(queries) <= 1
+        """
+        queries = []
+        thread_id = threading.get_ident()
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            if threading.get_ident() == thread_id:
+                queries.append(statement)
+
+        event.listen(self.__engine, 'before_cursor_execute', _record)
+        try:
+            yield queries
+        finally:
+            event.remove(self.__engine, 'before_cursor_execute', _record)
+
 
 # ********************************************************
-# INSTANCE GLOBALE (Pattern Singleton)
+# INSTANCE GLOBALE (Pattern Singleton, initialisation paresseuse)
 # ********************************************************
 
-storage = DBStorage()
+@functools.lru_cache(maxsize=1)
+def get_storage() -> DBStorage:
+    """Retourne l'instance unique de DBStorage, créée au premier appel.
+
+    L'engine et le pool ne sont plus construits à l'import : les
+    processus qui ne touchent pas la BDD (tests, outils CLI) n'en paient
+    pas le coût.
+    """
+    return DBStorage()
+
+
+class _LazyStorage:
+    """Proxy vers get_storage() : garde `from ... import storage` valable
+    sans créer l'engine à l'import."""
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_storage(), name)
+
+    def __repr__(self) -> str:
+        return '<storage (lazy DBStorage)>'
+
+
+def _reset_after_fork() -> None:
+    """Dans un worker forké (gunicorn), abandonne le pool hérité du parent."""
+    global _user_cache
+    if get_storage.cache_info().currsize:
+        get_storage().dispose(close=False)
+        get_storage.cache_clear()
+    # Nouveau cache : le verrou hérité a pu être pris par un thread du parent
+    _user_cache = _TTLCache(maxsize=_user_cache.maxsize, ttl=_user_cache.ttl)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+storage = _LazyStorage()
@@ -1,5 +1,5 @@
 """Module DBStorage."""
 
-from .DBStorage import storage
+from .DBStorage import get_storage, storage
 
-__all__ = ['storage']
+__all__ = ['get_storage', 'storage']
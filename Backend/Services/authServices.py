@@ -40,6 +40,8 @@ class AuthService:
             print("password")
             return False, None, error
 
+        email = InputValidator.normalize_email(email)
+
         name = InputValidator.sanitize_string(name, max_length=100)
         if not name:
             ("name")
@@ -81,14 +83,20 @@ class AuthService:
         3. Vérification mot de passe
         4. Génération token
         """
-        # 1. VALIDATION
+        # 1. VALIDATION (longueur du mot de passe bornée avant bcrypt)
+        if not isinstance(password, str) or len(password) > InputValidator.MAX_PASSWORD_LENGTH:
+            return False, None, "Identifiants invalides"
+
         is_valid, error = InputValidator.validate_email(email)
         if not is_valid:
             return False, None, "Identifiants invalides"  # Message générique (sécurité)
 
+        email = InputValidator.normalize_email(email)
+
         # 2. RECHERCHE USER
         user = self.storage.get_by_email(User, email)
         if not user:
+            PasswordManager.dummy_verify(password)  # même latence qu'un mauvais mot de passe
             return False, None, "Identifiants invalides"
 
         # 3. VÉRIFICATION MOT DE PASSE
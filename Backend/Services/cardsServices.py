@@ -1,8 +0,0 @@
-from .coreServices import coreServices
-
-
-class CardsServices(coreServices):
-    super().create()
-    super().read()
-    super().update()
-    super().delete()
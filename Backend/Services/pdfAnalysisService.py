@@ -7,15 +7,32 @@ Ce service gère :
 3. Génération de questions/réponses basées sur le PDF
 4. Transformation en Quiz ou Cards selon le type de session
 """
+import copy
+import functools
 import os
 import re
-from typing import Dict, List
-import PyPDF2
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List
 import json
 from groq import Groq
 from io import BytesIO
 from dotenv import load_dotenv
 
+# PyMuPDF (parseur natif en C, ~10x plus rapide) si installé, sinon PyPDF2
+try:
+    import fitz
+except ImportError:
+    fitz = None
+    import PyPDF2
+
+# orjson (parseur JSON en C) si installé, sinon json de la stdlib.
+# orjson.JSONDecodeError hérite de json.JSONDecodeError.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 load_dotenv()
 
 # Configuration Groq
@@ -25,6 +42,65 @@ if not GROQ_API_KEY:
 
 groq_client = Groq(api_key=GROQ_API_KEY)
 
+# Pool partagé pour lancer les appels Groq indépendants en parallèle
+# (le client Groq réutilise ses connexions HTTP keep-alive entre threads)
+_groq_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='groq')
+
+# Taille maximale d'un PDF accepté (vérifiée avant l'ouverture)
+MAX_PDF_SIZE = 20 * 1024 * 1024  # 20 Mo
+
+# Nombre de caractères du PDF envoyés à Groq pour chaque prompt
+THEME_PROMPT_CHARS = 4000
+QUESTIONS_PROMPT_CHARS = 6000
+
+# Balises markdown (```json ... ```) autour des réponses JSON de Groq,
+# compilées une fois pour tout le module
+_JSON_FENCE_RE = re.compile(r'```json\s*')
+_FENCE_RE = re.compile(r'```\s*')
+
+
+# ****************************************************************************
+# APPEL GROQ (AVEC CACHE)
+# ****************************************************************************
+@functools.lru_cache(maxsize=512)
+def _groq_json_cached(system: str, prompt: str, temperature: float, max_tokens: int):
+    """Appelle Groq et renvoie la réponse JSON déjà parsée.
+
+    Mis en cache par prompt complet (contenu, type de session, nombre de
+    questions) : un même PDF renvoyé ne déclenche pas de nouvel appel.
+    Les erreurs ne sont pas mises en cache.
+    """
+    response = groq_client.chat.completions.create(
+        model="llama-3.3-70b-versatile",
+        messages=[
+            {
+                "role": "system",
+                "content": system
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        temperature=temperature,
+        max_tokens=max_tokens
+    )
+
+    # Extraire la réponse
+    result_text = response.choices[0].message.content.strip()
+
+    # Nettoyer la réponse (enlever markdown si présent)
+    result_text = _JSON_FENCE_RE.sub('', result_text)
+    result_text = _FENCE_RE.sub('', result_text)
+
+    # Parser le JSON
+    return _json_loads(result_text)
+
+
+def _groq_json(system: str, prompt: str, temperature: float, max_tokens: int):
+    """Réponse JSON de Groq (copie : l'appelant peut la modifier sans toucher au cache)."""
+    return copy.deepcopy(_groq_json_cached(system, prompt, temperature, max_tokens))
+
 
 class PDFAnalysisService:
     """Service pour analyser des PDFs et générer du contenu éducatif."""
@@ -34,11 +110,13 @@ class PDFAnalysisService:
     # ********************************************************
 
     @staticmethod
-    def extract_text_from_pdf(pdf_file) -> str:
+    def extract_text_from_pdf(pdf_file, max_chars: int = None) -> str:
         """Extrait le texte d'un fichier PDF.
 
         Args:
             pdf_file: Fichier PDF (FileStorage Flask ou BytesIO)
+            max_chars: Nombre maximal de caractères à extraire (None = tout).
+                Les pages suivantes ne sont pas lues une fois le budget atteint.
 
         Returns:
             Texte extrait du PDF
@@ -48,26 +126,38 @@ class PDFAnalysisService:
         """
         try:
 
-            # Convertir en BytesIO si nécessaire
+            # Taille annoncée par le client (FileStorage Flask) : refus immédiat
+            if (getattr(pdf_file, 'content_length', None) or 0) > MAX_PDF_SIZE:
+                raise ValueError(f"PDF too large (max {MAX_PDF_SIZE // (1024 * 1024)} MB)")
+
+            # Lire le contenu en bytes, sans dépasser MAX_PDF_SIZE + 1 octet :
+            # un fichier trop gros n'est jamais chargé entièrement en mémoire
             if hasattr(pdf_file, 'read'):
-                pdf_bytes = BytesIO(pdf_file.read())
+                pdf_bytes = pdf_file.read(MAX_PDF_SIZE + 1)
             else:
-                pdf_bytes = pdf_file
-
-            # Lire le PDF
-            pdf_reader = PyPDF2.PdfReader(pdf_bytes)
+                pdf_bytes = bytes(pdf_file)
 
-            if len(pdf_reader.pages) == 0:
-                raise ValueError("PDF is empty")
+            if len(pdf_bytes) > MAX_PDF_SIZE:
+                raise ValueError(f"PDF too large (max {MAX_PDF_SIZE // (1024 * 1024)} MB)")
 
             # Extraire le texte de toutes les pages
+            if fitz is not None:
+                pages = PDFAnalysisService._iter_pages_pymupdf(pdf_bytes)
+            else:
+                pages = PDFAnalysisService._iter_pages_pypdf2(pdf_bytes)
             text_content = []
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_content.append(page_text)
+            total_chars = 0
+            for page_text in pages:
+                if not page_text:
+                    continue
+                text_content.append(page_text)
+                total_chars += len(page_text) + 2
+                if max_chars is not None and total_chars >= max_chars:
+                    break
 
             full_text = "\n\n".join(text_content)
+            if max_chars is not None:
+                full_text = full_text[:max_chars]
 
             if not full_text.strip():
                 raise ValueError("No text could be extracted from PDF")
@@ -77,6 +167,24 @@ class PDFAnalysisService:
         except Exception as e:
             raise ValueError(f"Error extracting PDF text: {str(e)}")
 
+    @staticmethod
+    def _iter_pages_pymupdf(pdf_bytes: bytes) -> Iterator[str]:
+        """Texte de chaque page via PyMuPDF (mode "text" : ordre de lecture)."""
+        with fitz.open(stream=pdf_bytes, filetype='pdf') as document:
+            if document.page_count == 0:
+                raise ValueError("PDF is empty")
+            for page in document:
+                yield page.get_text("text")
+
+    @staticmethod
+    def _iter_pages_pypdf2(pdf_bytes: bytes) -> Iterator[str]:
+        """Texte de chaque page via PyPDF2 (repli si PyMuPDF est absent)."""
+        pdf_reader = PyPDF2.PdfReader(BytesIO(pdf_bytes))
+        if len(pdf_reader.pages) == 0:
+            raise ValueError("PDF is empty")
+        for page in pdf_reader.pages:
+            yield page.extract_text()
+
     # ********************************************************
     # ANALYSE DU THÈME PAR GROQ
     # ********************************************************
@@ -102,7 +210,7 @@ class PDFAnalysisService:
             }
         """
         # limiter le contenue à 4000 caractere pour le MVP
-        content_sample = pdf_content[:4000] if len(pdf_content) > 4000 else pdf_content
+        content_sample = pdf_content[:THEME_PROMPT_CHARS]
 
         prompt = f"""Analyze the following educational content and extract the main theme.
 
@@ -128,33 +236,13 @@ Important:
 - Return ONLY the JSON, no other text"""
 
         try:
-            response = groq_client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert educational content analyzer. Always respond with valid JSON only. Use the same language as the analyzed content for theme_name and description."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+            theme_data = _groq_json(
+                "You are an expert educational content analyzer. Always respond with valid JSON only. Use the same language as the analyzed content for theme_name and description.",
+                prompt,
                 temperature=0.3,
                 max_tokens=500
-
             )
 
-            # Extraire la réponse
-            result_text = response.choices[0].message.content.strip()
-
-            # Nettoyer la réponse (enlever markdown si présent)
-            result_text = re.sub(r'```json\s*', '', result_text)
-            result_text = re.sub(r'```\s*', '', result_text)
-
-            # Parser le JSON
-            theme_data = json.loads(result_text)
-
             # Valider la structure
             required_keys = ['theme_name', 'keywords', 'description']
             if not all(key in theme_data for key in required_keys):
@@ -213,7 +301,7 @@ Important:
         """
         # Limiter le contenu.
 
-        content_sample = pdf_content[:6000] if len(pdf_content) > 6000 else pdf_content
+        content_sample = pdf_content[:QUESTIONS_PROMPT_CHARS]
 
         if session_type == "QUIZ":
             prompt = f"""Based on the following educational content, generate {count} multiple-choice quiz questions.
@@ -273,32 +361,13 @@ Requirements:
 - Return ONLY the JSON, no other text"""
 
         try:
-            response = groq_client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert educator who creates high-quality study materials. CRITICAL: Generate all questions and answers in the SAME LANGUAGE as the provided content. If the content is in French, write in French. If in English, write in English."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+            questions_data = _groq_json(
+                "You are an expert educator who creates high-quality study materials. CRITICAL: Generate all questions and answers in the SAME LANGUAGE as the provided content. If the content is in French, write in French. If in English, write in English.",
+                prompt,
                 temperature=0.7,
                 max_tokens=3000
             )
 
-            # Extraire la réponse
-            result_text = response.choices[0].message.content.strip()
-
-            # Nettoyer la réponse
-            result_text = re.sub(r'```json\s*', '', result_text)
-            result_text = re.sub(r'```\s*', '', result_text)
-
-            # Parser le JSON
-            questions_data = json.loads(result_text)
-
             # Valider
             if 'questions' not in questions_data or not isinstance(questions_data['questions'], list):
                 raise ValueError("Invalid questions structure")
@@ -329,23 +398,31 @@ Requirements:
 
         Returns:
             Dict contenant:
-                - pdf_content: Contenu textuel extrait
+                - pdf_content: Contenu textuel extrait (tronqué au budget des prompts)
                 - theme: Données du thème (name, keywords, description)
                 - questions: Liste des questions générées
         """
-        # Etape 1: Extraire le texte.
-
-        pdf_content = PDFAnalysisService.extract_text_from_pdf(pdf_file)
-
-        # Etape 2: Analyser le theme
-        theme_data = PDFAnalysisService.analyze_theme_with_groq(pdf_content)
+        # Etape 1: Extraire le texte (seulement ce que les prompts utilisent)
+        pdf_content = PDFAnalysisService.extract_text_from_pdf(
+            pdf_file,
+            max_chars=max(THEME_PROMPT_CHARS, QUESTIONS_PROMPT_CHARS)
+        )
 
-        # Etape 3: Générer les questions
-        questions = PDFAnalysisService.generate_questions_from_pdf(
+        # Etapes 2 et 3: Analyser le thème et générer les questions.
+        # Les deux appels Groq sont indépendants : on les lance en parallèle
+        # pour ne payer qu'une seule latence réseau.
+        theme_future = _groq_executor.submit(
+            PDFAnalysisService.analyze_theme_with_groq,
+            pdf_content
+        )
+        questions_future = _groq_executor.submit(
+            PDFAnalysisService.generate_questions_from_pdf,
             pdf_content,
             session_type,
             questions_count
         )
+        theme_data = theme_future.result()
+        questions = questions_future.result()
 
         return {
             'pdf_content': pdf_content,
@@ -10,6 +10,7 @@ Gère :
 from Models.questionModel import Question
 from Models.answerModel import Answer
 from Models.sessionModel import Session
+from Models.themeModel import Theme
 from Models.tablesSchema import QuestionType, Difficulty, SessionType
 from typing import Optional, List, Dict, Tuple
 import random
@@ -50,7 +51,7 @@ class QuizzService:
             Tuple (Question créée, message d'erreur)
         """
         # Vérifier que le thème existe
-        theme = self.storage.get('Theme', theme_id)
+        theme = self.storage.get(Theme, theme_id)
         if not theme:
             return None, "Thème non trouvé"
 
@@ -75,9 +76,8 @@ class QuizzService:
         )
 
         self.storage.new(question)
-        self.storage.save()
 
-        # Incrémenter le compteur du thème
+        # Incrémenter le compteur du thème (même commit que la question)
         theme.questions_count += 1
         self.storage.save()
 
@@ -100,7 +100,7 @@ class QuizzService:
             Tuple (Answer créée, message d'erreur)
         """
         # Vérifier que la question existe
-        question = self.storage.get('Question', question_id)
+        question = self.storage.get(Question, question_id)
         if not question:
             return None, "Question non trouvée"
 
@@ -138,19 +138,15 @@ class QuizzService:
             Tuple (Session créée, Liste des questions, message d'erreur)
         """
         # Vérifier que le thème existe
-        theme = self.storage.get('Theme', theme_id)
+        theme = self.storage.get(Theme, theme_id)
         if not theme:
             return None, [], "Thème non trouvé"
 
-        # Récupérer les questions du thème (type QUIZ uniquement)
-        all_questions = self.storage.filter_by('Question', theme_id=theme_id)
-        quiz_questions = [q for q in all_questions if q.type == QuestionType.QUIZ and not q.is_deleted()]
-
-        if len(quiz_questions) < questions_count:
+        # Sélectionner aléatoirement des questions QUIZ du thème
+        selected_questions = self._sample_questions(theme_id, QuestionType.QUIZ, questions_count)
+        if selected_questions is None:
             return None, [], f"Pas assez de questions (minimum {questions_count} requis)"
 
-        # Sélectionner aléatoirement
-        selected_questions = random.sample(quiz_questions, questions_count)
         question_ids = [q.id for q in selected_questions]
 
         # Créer la session
@@ -163,9 +159,8 @@ class QuizzService:
         )
 
         self.storage.new(session)
-        self.storage.save()
 
-        # Incrémenter le compteur du thème
+        # Incrémenter le compteur du thème (même commit que la session)
         theme.increment_usage()
         self.storage.save()
 
@@ -188,19 +183,15 @@ class QuizzService:
             Tuple (Session créée, Liste des flashcards, message d'erreur)
         """
         # Vérifier que le thème existe
-        theme = self.storage.get('Theme', theme_id)
+        theme = self.storage.get(Theme, theme_id)
         if not theme:
             return None, [], "Thème non trouvé"
 
-        # Récupérer les flashcards du thème
-        all_questions = self.storage.filter_by('Question', theme_id=theme_id)
-        flashcards = [q for q in all_questions if q.type == QuestionType.FLASHCARD and not q.is_deleted()]
-
-        if len(flashcards) < cards_count:
+        # Sélectionner aléatoirement des flashcards du thème
+        selected_cards = self._sample_questions(theme_id, QuestionType.FLASHCARD, cards_count)
+        if selected_cards is None:
             return None, [], f"Pas assez de flashcards (minimum {cards_count} requis)"
 
-        # Sélectionner aléatoirement
-        selected_cards = random.sample(flashcards, cards_count)
         card_ids = [c.id for c in selected_cards]
 
         # Créer la session
@@ -213,14 +204,35 @@ class QuizzService:
         )
 
         self.storage.new(session)
-        self.storage.save()
 
-        # Incrémenter le compteur du thème
+        # Incrémenter le compteur du thème (même commit que la session)
         theme.increment_usage()
         self.storage.save()
 
         return session, selected_cards, None
 
+    def _sample_questions(
+        self,
+        theme_id: str,
+        question_type: QuestionType,
+        count: int
+    ) -> Optional[List[Question]]:
+        """Tire au hasard count questions actives d'un type donné.
+
+        Seuls les IDs sont chargés pour le tirage (filtrés en SQL) ; les
+        objets Question ne sont chargés que pour les IDs retenus.
+
+        Returns:
+            Liste des questions, ou None s'il n'y en a pas assez
+        """
+        ids = self.storage.all_ids(Question, theme_id=theme_id, type=question_type)
+        if len(ids) < count:
+            return None
+
+        chosen_ids = random.sample(ids, count)
+        questions = self.storage.bulk_get(Question, chosen_ids)
+        return [questions[q_id] for q_id in chosen_ids if q_id in questions]
+
     # ********************************************************
     # SOUMISSION QUIZ
     # ********************************************************
@@ -239,7 +251,7 @@ class QuizzService:
             Tuple (Session mise à jour, Résultats détaillés, message d'erreur)
         """
         # Récupérer la session
-        session = self.storage.get('Session', session_id)
+        session = self.storage.get(Session, session_id)
         if not session:
             return None, None, "Session non trouvée"
 
@@ -254,32 +266,50 @@ class QuizzService:
         max_score = len(session.questions_ids)
         results = []
 
+        # Chargement groupé, colonnes seules (pas d'objets ORM) : IDs des
+        # questions existantes, puis ID de la bonne réponse de chacune
+        existing_ids = {
+            question_id for question_id, in self.storage.filter_in(
+                Question, 'id', session.questions_ids, columns=('id',)
+            )
+        }
+        correct_answers = {}
+        for question_id, answer_id in self.storage.filter_in(
+            Answer, 'question_id', existing_ids,
+            columns=('question_id', 'id'), is_correct=True
+        ):
+            correct_answers.setdefault(question_id, answer_id)
+
+        answered_ids = []
+        correct_ids = []
+
         for question_id in session.questions_ids:
-            question = self.storage.get('Question', question_id)
-            if not question:
+            if question_id not in existing_ids:
                 continue
 
-            # Récupérer les réponses de la question
-            question_answers = self.storage.filter_by('Answer', question_id=question_id)
-            correct_answer = next((a for a in question_answers if a.is_correct), None)
+            correct_answer_id = correct_answers.get(question_id)
 
             # Vérifier si l'utilisateur a répondu correctement
             user_answer_id = answers.get(question_id)
-            is_correct = user_answer_id == correct_answer.id if correct_answer else False
+            is_correct = correct_answer_id is not None and user_answer_id == correct_answer_id
 
             if is_correct:
                 score += 1
-
-            # Incrémenter les stats de la question
-            question.increment_usage(is_correct=is_correct)
+                correct_ids.append(question_id)
+            answered_ids.append(question_id)
 
             results.append({
                 'question_id': question_id,
                 'user_answer_id': user_answer_id,
-                'correct_answer_id': correct_answer.id if correct_answer else None,
+                'correct_answer_id': correct_answer_id,
                 'is_correct': is_correct
             })
 
+        # Stats des questions : 2 UPDATE groupés au lieu d'un par question,
+        # validés avec la session dans un seul commit
+        self.storage.increment(Question, answered_ids, times_used=1)
+        self.storage.increment(Question, correct_ids, times_correct=1)
+
         # Compléter la session
         session.complete_session(score=score, max_score=max_score)
         self.storage.save()
@@ -303,22 +333,20 @@ class QuizzService:
         Returns:
             Dictionnaire de statistiques
         """
-        # Récupérer toutes les sessions de l'utilisateur
-        all_sessions = self.storage.filter_by('Session', user_id=user_id)
-        completed_sessions = [s for s in all_sessions if s.is_completed()]
-
-        quiz_sessions = [s for s in completed_sessions if s.type == SessionType.QUIZ]
-        flashcard_sessions = [s for s in completed_sessions if s.type == SessionType.FLASHCARD]
+        # Sessions terminées agrégées par type (une requête GROUP BY)
+        stats = self.storage.get_session_stats(user_id)
+        empty = {'count': 0, 'success_rate_sum': 0.0}
+        quiz = stats.get(SessionType.QUIZ, empty)
+        flashcard = stats.get(SessionType.FLASHCARD, empty)
 
         # Calculer la moyenne des scores
         avg_score = 0.0
-        if quiz_sessions:
-            total_success = sum(s.get_success_rate() for s in quiz_sessions)
-            avg_score = total_success / len(quiz_sessions)
+        if quiz['count']:
+            avg_score = quiz['success_rate_sum'] / quiz['count']
 
         return {
-            'total_sessions': len(completed_sessions),
-            'quiz_sessions': len(quiz_sessions),
-            'flashcard_sessions': len(flashcard_sessions),
+            'total_sessions': sum(s['count'] for s in stats.values()),
+            'quiz_sessions': quiz['count'],
+            'flashcard_sessions': flashcard['count'],
             'average_score': round(avg_score, 2)
         }
@@ -11,10 +11,13 @@ Utilise une approche simple mais efficace basée sur :
 """
 
 
-from typing import List, Dict
+from typing import List, Dict, FrozenSet, Iterable
 import re
 from collections import Counter
 
+# Tout ce qui n'est ni lettre, ni chiffre, ni espace (compilé une fois)
+_NON_WORD_RE = re.compile(r'[^a-zà-ÿ0-9\s]')
+
 
 class SimilarityService:
     """Service pour calculer la similarité entre textes et questions."""
@@ -55,7 +58,7 @@ class SimilarityService:
         text = text.lower()
 
         # Garder uniquement les lettres, chiffres et espaces
-        text = re.sub(r'[^a-zà-ÿ0-9\s]', ' ', text)
+        text = _NON_WORD_RE.sub(' ', text)
 
         # Tokenize
         words = text.split()
@@ -139,9 +142,34 @@ class SimilarityService:
 
             return 0.0
 
-        set1 = set(k.lower().strip() for k in text_keywords)
-        set2 = set(k.lower().strip() for k in target_keywords)
+        return SimilarityService.keyword_set_overlap(
+            SimilarityService.normalize_keywords(text_keywords),
+            SimilarityService.normalize_keywords(target_keywords)
+        )
+
+    @staticmethod
+    def normalize_keywords(keywords: Iterable[str]) -> FrozenSet[str]:
+        """Normalise une liste de mots-clés (minuscules, sans espaces).
+
+        Args:
+            keywords: Mots-clés bruts
 
+        Returns:
+            Set figé des mots-clés normalisés
+        """
+        return frozenset(k.lower().strip() for k in keywords)
+
+    @staticmethod
+    def keyword_set_overlap(set1: FrozenSet[str], set2: FrozenSet[str]) -> float:
+        """Chevauchement entre deux sets de mots-clés déjà normalisés.
+
+        Args:
+            set1: Mots-clés normalisés (voir normalize_keywords)
+            set2: Mots-clés normalisés
+
+        Returns:
+            Score entre 0.0 et 1.0
+        """
         intersection = set1 & set2
 
         # Calculer par rapport à la taille du plus petit set
@@ -231,13 +259,21 @@ class SimilarityService:
 
         best_score = 0.0
 
+        if not pdf_keywords:
+            return best_match
+
+        # Normaliser les mots-clés du PDF une seule fois pour tous les thèmes
+        pdf_set = SimilarityService.normalize_keywords(pdf_keywords)
+
         for theme in themes:
             theme_keywords = theme.get('keywords', [])
+            if not theme_keywords:
+                continue
 
             # Calculer le chevauchement
-            overlap = SimilarityService.calculate_keyword_overlap(
-                pdf_keywords,
-                theme_keywords
+            overlap = SimilarityService.keyword_set_overlap(
+                pdf_set,
+                SimilarityService.normalize_keywords(theme_keywords)
             )
 
             # Mettre à jour si meilleur score
@@ -53,6 +53,11 @@ class UserService:
         Returns:
             Tuple (User créé, message d'erreur)
         """
+        # Vérifier unicité email AVANT validate_and_create, qui hashe le mot
+        # de passe (bcrypt) : un doublon ne coûte qu'un lookup indexé
+        if self.storage.get_by_email(User, email, include_deleted=True):
+            return None, "Un utilisateur avec cet email existe déjà"
+
         # Validation avec Utils
         user, error = User.validate_and_create(
             first_name=first_name,
@@ -65,11 +70,6 @@ class UserService:
         if error:
             return None, error
 
-        # Vérifier unicité email
-        existing_users = self.storage.filter_by('User', email=email)
-        if existing_users:
-            return None, "Un utilisateur avec cet email existe déjà"
-
         # Sauvegarder
         self.storage.new(user)
         self.storage.save()
@@ -88,10 +88,7 @@ class UserService:
         Returns:
             User ou None
         """
-        user = self.storage.get('User', user_id)
-        if user and not user.is_deleted():
-            return user
-        return None
+        return self.storage.get(User, user_id)
 
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Récupère un utilisateur par son email.
@@ -102,10 +99,9 @@ class UserService:
         Returns:
             User ou None
         """
-        users = self.storage.filter_by('User', email=email.lower().strip())
-        if users and not users[0].is_deleted():
-            return users[0]
-        return None
+        # get_by_email normalise l'email, exclut les supprimés et passe par
+        # le cache TTL du storage (invalidé à chaque modification du User)
+        return self.storage.get_by_email(User, email)
 
     def get_all_users(self, include_deleted: bool = False) -> list[User]:
         """Récupère tous les utilisateurs.
@@ -116,13 +112,9 @@ class UserService:
         Returns:
             Liste d'utilisateurs
         """
-        users_dict = self.storage.all('User')
-        users = list(users_dict.values())
-
-        if not include_deleted:
-            users = [u for u in users if not u.is_deleted()]
-
-        return users
+        # Le filtre soft delete est fait en SQL par le storage
+        users_dict = self.storage.all(User, include_deleted=include_deleted)
+        return list(users_dict.values())
 
     # ********************************************************
     # UPDATE
@@ -223,7 +215,7 @@ class UserService:
         Returns:
             Tuple (success, message d'erreur)
         """
-        user = self.storage.get('User', user_id)
+        user = self.storage.get(User, user_id)
         if not user:
             return False, "Utilisateur non trouvé"
 
@@ -251,11 +243,16 @@ class UserService:
         """
         user = self.get_user_by_email(email)
         if not user:
+            PasswordManager.dummy_verify(password)  # même latence qu'un mauvais mot de passe
             return None, "Email ou mot de passe incorrect"
 
         if not user.verify_password(password):
             return None, "Email ou mot de passe incorrect"
 
+        # Aligner le hash sur le coût bcrypt courant (même commit que last_login)
+        if PasswordManager.needs_rehash(user.password):
+            user.password = PasswordManager.hash_password(password)
+
         # Mettre à jour last_login
         user.update_last_login()
         self.storage.save()
@@ -5,7 +5,7 @@ Middleware Auth & Admin - Vérification de l'authentification et des privilèges
 - @admin_required : utilisateur admin uniquement (avec auto-refresh)
 """
 from functools import wraps
-from flask import request, jsonify
+from flask import g, request, jsonify
 from Utils.tokenSecurity import token_manager
 from Persistence.DBStorage import storage
 from Models.userModel import User
@@ -58,7 +58,15 @@ def _resolve_payload():
         - payload           : payload JWT si valide, sinon None
         - new_access_token  : nouveau token si refresh effectué, sinon None
         - error_response    : réponse Flask (jsonify, status) à retourner en cas d'échec
+
+    Le résultat valide est mémorisé dans flask.g : décorateurs empilés ou
+    appels répétés dans la même requête ne redécodent pas le token (et
+    un auto-refresh ne génère qu'un seul nouveau token).
     """
+    resolved = g.get('_auth_resolved')
+    if resolved is not None:
+        return resolved[0], resolved[1], None
+
     token = _get_access_token()
 
     if not token:
@@ -70,6 +78,7 @@ def _resolve_payload():
     payload = token_manager.decode_access_token(token)
 
     if payload:
+        g._auth_resolved = (payload, None)
         return payload, None, None
 
     # Access token invalide ou expiré → tenter le refresh
@@ -97,9 +106,10 @@ def _resolve_payload():
             'message': 'Payload incomplet'
         }), 401)
 
-    new_access_token, _ = token_manager.generate_tokens(user_id, email)
-    new_payload = token_manager.decode_access_token(new_access_token)
+    # Seul l'access token est renouvelé ; son payload est connu, pas de décodage
+    new_access_token, new_payload = token_manager.generate_access_token(user_id, email)
 
+    g._auth_resolved = (new_payload, new_access_token)
     return new_payload, new_access_token, None
 
 
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from typing import Optional, Tuple
 
 
@@ -8,6 +9,22 @@ class InputValidator:
     # Regex pour email valide
     EMAIL_REGEX = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
+    # Longueurs maximales : vérifiées avant tout traitement coûteux
+    # (regex, parcours, bcrypt)
+    MAX_EMAIL_LENGTH = 254  # RFC 5321
+    MAX_PASSWORD_LENGTH = 128
+
+    # Caractères spéciaux acceptés dans un mot de passe
+    PASSWORD_SPECIAL_CHARS = frozenset('!@#$%^&*(),.?":{}|<>')
+
+    @staticmethod
+    def normalize_email(email: str) -> str:
+        """Forme canonique d'un email (sans espaces, minuscules).
+
+        Seule forme stockée et comparée : à appliquer dès la réception.
+        """
+        return email.strip().lower()
+
     @staticmethod
     def validate_email(email: str) -> Tuple[bool, Optional[str]]:
         """Valide un email.
@@ -23,16 +40,26 @@ class InputValidator:
         if not email or not isinstance(email, str):
             return False, "Email requis"
 
-        email = email.strip().lower()
+        email = InputValidator.normalize_email(email)
 
-        if len(email) > 254:  # RFC 5321
+        if len(email) > InputValidator.MAX_EMAIL_LENGTH:
             return False, "Email trop long"
 
-        if not InputValidator.EMAIL_REGEX.match(email):
+        # Préfiltre sans regex : rejette les cas évidents sans polluer le cache
+        if len(email) < 6 or '@' not in email:
+            return False, "Format d'email invalide"
+
+        if not InputValidator._matches_email_format(email):
             return False, "Format d'email invalide"
 
         return True, None
 
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _matches_email_format(email: str) -> bool:
+        """Applique EMAIL_REGEX (résultat mémorisé par email normalisé)."""
+        return InputValidator.EMAIL_REGEX.match(email) is not None
+
     @staticmethod
     def validate_password(password: str) -> Tuple[bool, Optional[str]]:
         """Valide un mot de passe.
@@ -50,19 +77,38 @@ class InputValidator:
         if len(password) < 8:
             return False, "Minimum 8 caractères"
 
-        if len(password) > 128:
-            return False, "Mot de passe trop long (max 128)"
-
-        if not re.search(r'[A-Z]', password):
+        if len(password) > InputValidator.MAX_PASSWORD_LENGTH:
+            return False, f"Mot de passe trop long (max {InputValidator.MAX_PASSWORD_LENGTH})"
+
+        # Un seul parcours (au lieu de 4 regex), arrêté dès que tout est trouvé
+        has_upper = has_lower = has_digit = has_special = False
+        special_chars = InputValidator.PASSWORD_SPECIAL_CHARS
+        for char in password:
+            if 'A' <= char <= 'Z':
+                has_upper = True
+            elif 'a' <= char <= 'z':
+                has_lower = True
+            elif '0' <= char <= '9':
+                has_digit = True
+            elif char in special_chars:
+                has_special = True
+            elif char.isdecimal():  # Chiffres Unicode, comme \d
+                has_digit = True
+            else:
+                continue
+            if has_upper and has_lower and has_digit and has_special:
+                break
+
+        if not has_upper:
             return False, "Au moins 1 majuscule requise"
 
-        if not re.search(r'[a-z]', password):
+        if not has_lower:
             return False, "Au moins 1 minuscule requise"
 
-        if not re.search(r'\d', password):
+        if not has_digit:
             return False, "Au moins 1 chiffre requis"
 
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+        if not has_special:
             return False, "Au moins 1 caractère spécial requis"
 
         return True, None
@@ -1,12 +1,22 @@
 """Module de gestion sécurisée des mots de passe avec bcrypt."""
+import functools
+import secrets
+import time
+
 import bcrypt
 
+from config import Config
+
+# Coût bcrypt (2^rounds itérations) : Config.BCRYPT_LOG_ROUNDS, ajustable par
+# environnement selon la machine (voir PasswordManager.calibrate_rounds)
+BCRYPT_LOG_ROUNDS = Config.BCRYPT_LOG_ROUNDS
+
 
 class PasswordManager:
     """Gestion sécurisée des mots de passe."""
 
     @staticmethod
-    def hash_password(password: str) -> str:
+    def hash_password(password: str, rounds: int = None) -> str:
         """Hash un mot de passe avec bcrypt.
 
         Pourquoi bcrypt ?
@@ -16,12 +26,13 @@ class PasswordManager:
 
         Args:
             password: Mot de passe en clair
+            rounds: Coût bcrypt (défaut : BCRYPT_LOG_ROUNDS)
 
         Returns:
             Hash sécurisé (stockable en DB)
         """
         # Génère un salt et hash le mot de passe
-        salt = bcrypt.gensalt(rounds=12)  # 12 rounds = bon équilibre sécurité/performance
+        salt = bcrypt.gensalt(rounds=rounds or BCRYPT_LOG_ROUNDS)
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
 
@@ -36,7 +47,84 @@ class PasswordManager:
         Returns:
             True si le mot de passe est correct
         """
+        # checkpw compare les hash en temps constant
         return bcrypt.checkpw(
             password.encode('utf-8'),
             hashed.encode('utf-8')
         )
+
+    @staticmethod
+    def needs_rehash(hashed: str) -> bool:
+        """Indique si un hash n'est pas au coût courant (BCRYPT_LOG_ROUNDS).
+
+        Un hash bcrypt a la forme "$2b$<coût>$..." : après une baisse (ou
+        hausse) de BCRYPT_LOG_ROUNDS, les anciens comptes gardent leur coût
+        jusqu'à être re-hachés à la connexion suivante.
+
+        Args:
+            hashed: Hash stocké en DB
+
+        Returns:
+            True si le hash doit être recalculé
+        """
+        try:
+            return int(hashed.split('$')[2]) != BCRYPT_LOG_ROUNDS
+        except (IndexError, ValueError):
+            return False
+
+    @staticmethod
+    def calibrate_rounds(target_ms: float = 250, min_rounds: int = 10, max_rounds: int = 16) -> int:
+        """Mesure le coût bcrypt adapté à la machine courante.
+
+        Chaque round supplémentaire double le temps de hash : on mesure
+        un hash au coût minimal puis on extrapole jusqu'à la cible.
+        À lancer une fois (déploiement) pour fixer BCRYPT_LOG_ROUNDS.
+
+        Args:
+            target_ms: Durée de hash visée en millisecondes
+            min_rounds: Coût minimal accepté
+            max_rounds: Coût maximal accepté
+
+        Returns:
+            Plus grand coût dont le hash reste sous target_ms (borné)
+        """
+        salt = bcrypt.gensalt(rounds=min_rounds)
+        start = time.perf_counter()
+        bcrypt.hashpw(b'calibration', salt)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        rounds = min_rounds
+        while rounds < max_rounds and elapsed_ms * 2 <= target_ms:
+            rounds += 1
+            elapsed_ms *= 2
+        return rounds
+
+    @staticmethod
+    def dummy_verify(password: str) -> bool:
+        """Vérification factice quand l'utilisateur n'existe pas.
+
+        Coûte autant qu'un vrai verify_password : un email inconnu et un
+        mauvais mot de passe répondent dans le même temps (pas
+        d'énumération des comptes par mesure de latence).
+
+        Returns:
+            Toujours False
+        """
+        PasswordManager.verify_password(password, _dummy_hash())
+        return False
+
+    @staticmethod
+    def warm_up() -> None:
+        """Calcule d'avance le hash factice de dummy_verify.
+
+        À appeler au démarrage du serveur : la première connexion avec un
+        email inconnu ne paie alors pas un hash bcrypt en plus (latence
+        qui trahirait l'absence du compte).
+        """
+        _dummy_hash()
+
+
+@functools.lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    """Hash d'un secret aléatoire, calculé au premier besoin (pas à l'import)."""
+    return PasswordManager.hash_password(secrets.token_urlsafe(16))
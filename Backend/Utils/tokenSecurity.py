@@ -1,7 +1,11 @@
 """Module de gestion des tokens JWT pour l'authentification."""
 import jwt
-from datetime import datetime, timedelta
 import os
+import time
+from typing import Dict, Tuple
+
+ACCESS_TOKEN_LIFETIME = 30 * 60        # 30 minutes
+REFRESH_TOKEN_LIFETIME = 7 * 24 * 3600  # 7 jours
 
 
 class TokenManager:
@@ -13,34 +17,57 @@ class TokenManager:
         self.refresh_secret = secret_key + "_refresh"
         self.algorithm = 'HS256'
 
-    def generate_tokens(self, user_id: str, email: str):
-        """Crée un access token (30min) et un refresh token (7j)."""
-        now = datetime.utcnow()
+        # Préparés une fois : clés en bytes (pas de ré-encodage à chaque
+        # signature/vérification), algorithmes et options pour decode()
+        # (exp, iat et user_id obligatoires) et décodeur PyJWT réutilisé
+        self._access_key = self.secret_key.encode('utf-8')
+        self._refresh_key = self.refresh_secret.encode('utf-8')
+        self._algorithms = [self.algorithm]
+        self._decode_options = {'require': ['exp', 'iat', 'user_id']}
+        self._jwt = jwt.PyJWT()
 
-        # Access token (court)
-        access_token = jwt.encode({
+    def generate_access_token(self, user_id: str, email: str) -> Tuple[str, Dict]:
+        """Crée uniquement un access token (30min).
+
+        Returns:
+            (token, payload) : le payload est celui que decode_access_token
+            renverrait, inutile de re-décoder le token
+        """
+        now = int(time.time())
+        payload = {
             'user_id': user_id,
             'email': email,
             'type': 'access',
-            'exp': now + timedelta(minutes=30),
+            'exp': now + ACCESS_TOKEN_LIFETIME,
             'iat': now
-        }, self.secret_key, algorithm=self.algorithm)
+        }
+        token = jwt.encode(payload, self._access_key, algorithm=self.algorithm)
+        return token, payload
+
+    def generate_tokens(self, user_id: str, email: str):
+        """Crée un access token (30min) et un refresh token (7j)."""
+        # Access token (court)
+        access_token, payload = self.generate_access_token(user_id, email)
+        now = payload['iat']
 
         # Refresh token (long)
         refresh_token = jwt.encode({
             'user_id': user_id,
             'email': email,
             'type': 'refresh',
-            'exp': now + timedelta(days=7),
+            'exp': now + REFRESH_TOKEN_LIFETIME,
             'iat': now
-        }, self.refresh_secret, algorithm=self.algorithm)
+        }, self._refresh_key, algorithm=self.algorithm)
 
         return access_token, refresh_token
 
     def decode_access_token(self, token):
         """Décode l'access token."""
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            payload = self._jwt.decode(
+                token, self._access_key,
+                algorithms=self._algorithms, options=self._decode_options
+            )
             if payload.get('type') != 'access':
                 return None
             return payload
@@ -52,7 +79,10 @@ class TokenManager:
     def decode_refresh_token(self, token):
         """Décode le refresh token."""
         try:
-            payload = jwt.decode(token, self.refresh_secret, algorithms=[self.algorithm])
+            payload = self._jwt.decode(
+                token, self._refresh_key,
+                algorithms=self._algorithms, options=self._decode_options
+            )
             if payload.get('type') != 'refresh':
                 return None
             return payload
@@ -9,12 +9,19 @@ from flask import Flask
 from flask_cors import CORS
 from dotenv import load_dotenv
 from Persistence.DBStorage import storage
+from Utils.passwordSecurity import PasswordManager
 
 load_dotenv()
 
 app = Flask(__name__)
 CORS(app)
 
+# Tables manquantes créées une seule fois, au démarrage
+storage.init_schema()
+
+# Hash factice de dummy_verify calculé avant la première requête
+PasswordManager.warm_up()
+
 @app.teardown_appcontext
 def shutdown_session(exception=None):
     storage.close()
@@ -31,6 +31,7 @@ for model_name, filename in [
     ("Models.baseModel",     "Models/baseModel.py"),
     ("Models.userModel",     "Models/userModel.py"),
     ("Models.themeModel",    "Models/themeModel.py"),
+    ("Models.themeKeywordModel", "Models/themeKeywordModel.py"),
     ("Models.questionModel", "Models/questionModel.py"),
     ("Models.answerModel",   "Models/answerModel.py"),
     ("Models.sessionModel",  "Models/sessionModel.py"),
@@ -0,0 +1,57 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'Backend'))
+
+from Models.tablesSchema import Base  # noqa: E402
+from Models.userModel import User  # noqa: E402
+from Persistence import DBStorage as db_storage  # noqa: E402
+
+# Base de test : SQLite en mémoire par défaut, PostgreSQL via TEST_DATABASE_URL
+TEST_DATABASE_URL = os.getenv('TEST_DATABASE_URL', 'sqlite:///:memory:')
+
+
+@pytest.fixture(scope='module')
+def db():
+    """Storage partagé par les tests d'un module : schéma créé une fois,
+    connexions du pool conservées entre les tests."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('DATABASE_URL', TEST_DATABASE_URL)
+        storage = db_storage.DBStorage()
+    storage.reload()
+    yield storage
+    storage.dispose()
+
+
+def _truncate(storage):
+    """Vide toutes les tables (TRUNCATE sous PostgreSQL, DELETE sinon)."""
+    session = storage._DBStorage__session
+    tables = [table.name for table in reversed(Base.metadata.sorted_tables)]
+    if storage.dialect == 'postgresql':
+        session.execute(text(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY CASCADE"))
+    else:
+        for table in tables:
+            session.execute(text(f"DELETE FROM {table}"))
+    session.commit()
+
+
+@pytest.fixture
+def storage(db):
+    # Cache User partagé par le processus : vidé entre deux tests
+    db_storage._user_cache.clear()
+    yield db
+    db.rollback()
+    db.close()
+    _truncate(db)
+    db.close()
+
+
+@pytest.fixture
+def user(storage):
+    u = User(first_name='Ada', last_name='Lovelace', email='ada@example.com', password='x')
+    storage.new(u)
+    storage.save()
+    return u
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+from flask import Flask
+
+# Le package Api importe aussi la pipeline PDF (client Groq créé à l'import)
+pytest.importorskip('groq')
+os.environ.setdefault('GROQ_API_KEY', 'test')
+
+from Api import authRoutes  # noqa: E402
+
+
+@pytest.fixture
+def client(storage, monkeypatch):
+    monkeypatch.setattr(authRoutes, 'storage', storage)
+    app = Flask(__name__)
+    app.register_blueprint(authRoutes.auth_bp)
+    return app.test_client()
+
+
+@pytest.fixture
+def account(storage, user):
+    user.password = authRoutes.PasswordManager.hash_password('Secret-pass1', rounds=4)
+    storage.save()
+    return user
+
+
+def login(client, email, password):
+    return client.post('/api/auth/login', json={'email': email, 'password': password})
+
+
+def test_login_success(client, account):
+    response = login(client, 'ADA@example.com', 'Secret-pass1')
+    assert response.status_code == 200
+    assert response.get_json()['user']['id'] == account.id
+
+
+@pytest.mark.parametrize('email, password', [
+    ('ada@example.com', 'wrong-pass'),
+    ('nobody@example.com', 'Secret-pass1'),
+])
+def test_login_invalid_credentials(client, account, email, password):
+    response = login(client, email, password)
+    assert response.status_code == 401
+    assert response.get_json()['error'] == 'Identifiants invalides'
+
+
+def test_login_deleted_account(client, storage, account):
+    storage.delete(account)
+    storage.save()
+
+    response = login(client, 'ada@example.com', 'Secret-pass1')
+    assert response.status_code == 401
+    assert response.get_json()['error'] == 'Compte supprimé'
+
+    # Mauvais mot de passe : rien ne révèle la suppression du compte
+    response = login(client, 'ada@example.com', 'wrong-pass')
+    assert response.get_json()['error'] == 'Identifiants invalides'
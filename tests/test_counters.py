@@ -0,0 +1,45 @@
+from Models.questionModel import Question
+from Models.tablesSchema import QuestionType
+from Models.themeModel import Theme
+
+
+def add_theme(storage, user):
+    theme = Theme(user_id=user.id, name='Python', keywords=['python'])
+    storage.new(theme)
+    storage.save()
+    return theme
+
+
+def test_increment_before_insert_is_python_addition(user):
+    theme = Theme(user_id=user.id, name='Python', keywords=[])
+    theme.increment_usage()
+    assert theme.times_used == 1
+
+
+def test_double_increment_before_flush(storage, user):
+    theme = add_theme(storage, user)
+    theme.increment_usage()
+    theme.increment_usage()
+    storage.save()
+    assert theme.times_used == 2
+
+
+def test_to_dict_before_flush_returns_int(storage, user):
+    theme = add_theme(storage, user)
+    theme.increment_usage()
+    theme.increment_usage()
+    assert theme.to_dict()['times_used'] == 2
+    storage.save()
+    assert theme.times_used == 2
+
+
+def test_success_rate_before_flush(storage, user):
+    theme = add_theme(storage, user)
+    question = Question(theme_id=theme.id, type=QuestionType.QUIZ, question_text='2 + 2 ?')
+    storage.new(question)
+    storage.save()
+
+    question.increment_usage(is_correct=True)
+    question.increment_usage(is_correct=False)
+    assert question.get_success_rate() == 50.0
+    assert question.to_dict()['times_correct'] == 1
@@ -0,0 +1,64 @@
+import pytest
+
+from Models.answerModel import Answer
+from Models.questionModel import Question
+from Models.tablesSchema import QuestionType
+from Models.themeModel import Theme
+from Services.questionServices import QuizzService
+
+
+def add_quiz_theme(storage, user, count):
+    theme = Theme(user_id=user.id, name=f'Quiz {count}', keywords=['quiz'])
+    storage.new(theme)
+    storage.flush()
+    for i in range(count):
+        question = Question(theme_id=theme.id, type=QuestionType.QUIZ, question_text=f'Q{i} ?')
+        storage.new(question)
+        storage.flush()
+        storage.new(Answer(question_id=question.id, answer_text='ok', is_correct=True))
+        storage.new(Answer(question_id=question.id, answer_text='ko', is_correct=False))
+    storage.save()
+    return theme
+
+
+def sample_queries(storage, user, count):
+    theme = add_quiz_theme(storage, user, count)
+    service = QuizzService(storage)
+    storage.close()
+    with storage.count_queries() as queries:
+        questions = service._sample_questions(theme.id, QuestionType.QUIZ, count)
+    assert len(questions) == count
+    return len(queries)
+
+
+def submit_queries(storage, user, count):
+    theme = add_quiz_theme(storage, user, count)
+    service = QuizzService(storage)
+    session, questions, error = service.create_quiz_session(user.id, theme.id, count)
+    assert error is None
+    correct = {a.question_id: a.id for a in storage.filter_in(
+        Answer, 'question_id', session.questions_ids, is_correct=True)}
+    session_id = session.id
+    storage.close()
+
+    with storage.count_queries() as queries:
+        session, results, error = service.submit_quiz(session_id, correct)
+    assert error is None
+    assert results['score'] == count
+    return len(queries)
+
+
+@pytest.mark.parametrize('measure', [sample_queries, submit_queries])
+def test_query_count_independent_of_question_count(storage, user, measure):
+    # Pas de N+1 : le nombre de requêtes ne dépend pas du nombre de questions
+    assert measure(storage, user, 2) == measure(storage, user, 20)
+
+
+def test_sample_questions_budget(storage, user):
+    # IDs puis objets : deux SELECT
+    assert sample_queries(storage, user, 5) == 2
+
+
+def test_submit_quiz_budget(storage, user):
+    # Session, questions, bonnes réponses, 2 UPDATE de stats, UPDATE session
+    assert submit_queries(storage, user, 5) == 6
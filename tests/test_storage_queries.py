@@ -0,0 +1,134 @@
+from Models.answerModel import Answer
+from Models.questionModel import Question
+from Models.sessionModel import Session
+from Models.tablesSchema import Difficulty, QuestionType, SessionType
+from Models.themeModel import Theme
+
+
+def add_theme(storage, user, name='Python'):
+    theme = Theme(user_id=user.id, name=name, keywords=['python'])
+    storage.new(theme)
+    storage.save()
+    return theme
+
+
+def add_question(storage, theme, text='2 + 2 ?'):
+    question = Question(theme_id=theme.id, type=QuestionType.QUIZ, question_text=text)
+    storage.new(question)
+    storage.save()
+    return question
+
+
+def test_get_user_stats_single_query(storage, user):
+    theme = add_theme(storage, user)
+    question = add_question(storage, theme)
+    add_question(storage, theme, 'Deleted ?')
+    storage.delete(add_theme(storage, user, 'Deleted'))
+    storage.new(Session(user_id=user.id, theme_id=theme.id, type=SessionType.QUIZ,
+                        questions_ids=[question.id], questions_count=1))
+    storage.save()
+    storage.delete(storage.filter_by(Question, question_text='Deleted ?')[0])
+    storage.save()
+
+    with storage.count_queries() as queries:
+        stats = storage.get_user_stats(user.id)
+    assert stats == {'total_themes': 1, 'total_questions': 1, 'total_sessions': 1}
+    assert len(queries) == 1
+
+
+def test_bulk_insert_questions_and_answers(storage, user):
+    theme = add_theme(storage, user)
+    rows = [
+        {'id': 'q-1', 'theme_id': theme.id, 'type': QuestionType.QUIZ, 'question_text': 'A ?'},
+        {'theme_id': theme.id, 'type': QuestionType.QUIZ, 'question_text': 'B ?'},
+    ]
+
+    with storage.count_queries() as queries:
+        ids = storage.bulk_insert(Question, rows)
+        storage.bulk_insert(Answer, [
+            {'question_id': ids[0], 'answer_text': 'a', 'is_correct': True, 'order_position': 0},
+            {'question_id': ids[1], 'answer_text': 'b', 'is_correct': False, 'order_position': 0},
+        ])
+    storage.save()
+
+    assert len(queries) == 2
+    assert ids[0] == 'q-1' and len(ids) == 2
+    questions = storage.bulk_get(Question, ids)
+    assert [questions[i].question_text for i in ids] == ['A ?', 'B ?']
+    # Defaults de colonnes appliqués par l'INSERT Core
+    assert questions['q-1'].difficulty is Difficulty.MEDIUM
+    assert questions['q-1'].created_at is not None
+    assert storage.count(Answer) == 2
+
+
+def test_bulk_insert_empty(storage):
+    with storage.count_queries() as queries:
+        assert storage.bulk_insert(Question, []) == []
+    assert queries == []
+
+
+def add_answers(storage, question, correct='ok', wrong='ko'):
+    storage.new(Answer(question_id=question.id, answer_text=correct, is_correct=True))
+    storage.new(Answer(question_id=question.id, answer_text=wrong, is_correct=False))
+    storage.save()
+
+
+def test_filter_in_objects_and_filters(storage, user):
+    theme = add_theme(storage, user)
+    questions = [add_question(storage, theme, f'Q{i} ?') for i in range(3)]
+    for question in questions:
+        add_answers(storage, question)
+    storage.delete(questions[2])
+    storage.save()
+
+    ids = [q.id for q in questions]
+    assert {q.id for q in storage.filter_in(Question, 'id', ids + ids)} == set(ids[:2])
+    assert len(storage.filter_in(Question, 'id', ids, include_deleted=True)) == 3
+
+    correct = storage.filter_in(Answer, 'question_id', ids, is_correct=True)
+    assert sorted(a.answer_text for a in correct) == ['ok'] * 3
+
+
+def test_filter_in_columns(storage, user):
+    theme = add_theme(storage, user)
+    question = add_question(storage, theme)
+    add_answers(storage, question)
+
+    rows = storage.filter_in(Answer, 'question_id', [question.id],
+                             columns=('question_id', 'answer_text'), is_correct=True)
+    assert [tuple(row) for row in rows] == [(question.id, 'ok')]
+
+
+def test_filter_in_batches_values(storage, user):
+    theme = add_theme(storage, user)
+    question = add_question(storage, theme)
+    values = [question.id] + [f'missing-{i}' for i in range(1500)]
+
+    with storage.count_queries() as queries:
+        assert storage.filter_in(Question, 'id', values) == [question]
+    assert len(queries) == 2
+    assert storage.filter_in(Question, 'id', []) == []
+
+
+def test_increment_grouped_update(storage, user):
+    theme = add_theme(storage, user)
+    first, second, untouched = (add_question(storage, theme, f'Q{i} ?') for i in range(3))
+
+    with storage.count_queries() as queries:
+        storage.increment(Question, [first.id, second.id, first.id], times_used=1, times_correct=2)
+
+    # Doublons ignorés, une seule UPDATE, objets de la session synchronisés
+    assert len([q for q in queries if q.startswith('UPDATE')]) == 1
+    assert first.times_used == 1
+    storage.save()
+    assert (first.times_used, first.times_correct) == (1, 2)
+    assert (second.times_used, second.times_correct) == (1, 2)
+    assert (untouched.times_used, untouched.times_correct) == (0, 0)
+
+
+def test_increment_nothing_to_do(storage, user):
+    question = add_question(storage, add_theme(storage, user))
+    with storage.count_queries() as queries:
+        storage.increment(Question, [], times_used=1)
+        storage.increment(Question, [question.id])
+    assert queries == []
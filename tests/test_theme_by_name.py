@@ -0,0 +1,54 @@
+from Models.questionModel import Question
+from Models.tablesSchema import QuestionType
+from Models.themeModel import Theme
+
+
+def add_theme(storage, user, name='Python'):
+    theme = Theme(user_id=user.id, name=name, keywords=['python'])
+    storage.new(theme)
+    storage.save()
+    return theme
+
+
+def test_reuses_live_theme(storage, user):
+    theme = add_theme(storage, user)
+    assert storage.find_theme_by_name(user.id, 'Python') is theme
+    assert not theme.is_deleted()
+
+
+def test_unknown_name(storage, user):
+    add_theme(storage, user)
+    assert storage.find_theme_by_name(user.id, 'Java') is None
+
+
+def test_restores_deleted_theme(storage, user):
+    theme = add_theme(storage, user)
+    storage.delete(theme)
+    storage.save()
+    assert storage.get(Theme, theme.id) is None
+
+    assert storage.find_theme_by_name(user.id, 'Python') is theme
+    storage.save()
+    assert not theme.is_deleted()
+    assert storage.get(Theme, theme.id) is theme
+    assert storage.count(Theme, include_deleted=True) == 1
+
+
+def test_restore_keeps_counters_and_questions(storage, user):
+    theme = add_theme(storage, user)
+    question = Question(theme_id=theme.id, type=QuestionType.QUIZ, question_text='2 + 2 ?')
+    storage.new(question)
+    theme.questions_count = 1
+    theme.increment_usage()
+    storage.save()
+    storage.delete(theme)
+    storage.save()
+
+    # Comme create_session_with_pdf : restauration puis usage incrémenté
+    restored = storage.find_theme_by_name(user.id, 'Python')
+    restored.increment_usage()
+    storage.save()
+
+    assert restored.questions_count == 1
+    assert restored.times_used == 2
+    assert storage.filter_by(Question, theme_id=restored.id) == [question]
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+import pytest
+
+from Models.themeKeywordModel import ThemeKeyword
+from Models.themeModel import MAX_KEYWORD_LENGTH, Theme
+from Models.userModel import User
+
+
+def add_theme(storage, user, name, keywords):
+    theme = Theme(user_id=user.id, name=name, keywords=keywords)
+    storage.new(theme)
+    storage.save()
+    return theme
+
+
+def indexed_keywords(storage, theme):
+    return {row.keyword for row in storage.filter_by(ThemeKeyword, theme_id=theme.id)}
+
+
+def test_keywords_indexed_on_insert(storage, user):
+    theme = add_theme(storage, user, 'Python', ['Python', ' Flask ', ''])
+    assert indexed_keywords(storage, theme) == {'python', 'flask'}
+
+
+def test_keywords_reindexed_on_update(storage, user):
+    theme = add_theme(storage, user, 'Python', ['python', 'flask'])
+    theme.keywords = ['python', 'django']
+    storage.save()
+    assert indexed_keywords(storage, theme) == {'python', 'django'}
+
+
+def test_long_keywords_truncated(storage, user):
+    long_keyword = 'a' * (MAX_KEYWORD_LENGTH + 50)
+    theme = add_theme(storage, user, 'Long', [long_keyword])
+    assert indexed_keywords(storage, theme) == {'a' * MAX_KEYWORD_LENGTH}
+    assert storage.find_best_theme_match([long_keyword], user.id) == (theme, 1.0)
+
+
+def test_find_themes_by_keywords(storage, user):
+    web = add_theme(storage, user, 'Web', ['python', 'flask', 'html'])
+    data = add_theme(storage, user, 'Data', ['python', 'pandas'])
+    add_theme(storage, user, 'Java', ['java', 'spring'])
+
+    assert storage.find_themes_by_keywords(['python', 'flask'], 0.5, user.id) == [web, data]
+    assert storage.find_themes_by_keywords(['python', 'flask'], 1.0, user.id) == [web]
+    assert storage.find_themes_by_keywords(['rust'], 0.5, user.id) == []
+
+
+def test_find_themes_by_keywords_skips_deleted(storage, user):
+    theme = add_theme(storage, user, 'Web', ['python', 'flask'])
+    storage.delete(theme)
+    storage.save()
+    assert storage.find_themes_by_keywords(['python'], 0.5, user.id) == []
+
+
+def test_find_best_theme_match(storage, user):
+    web = add_theme(storage, user, 'Web', ['python', 'flask', 'html'])
+    add_theme(storage, user, 'Data', ['python', 'pandas'])
+
+    # Score = mots-clés communs / taille du plus petit set : Web 2/3, Data 1/2
+    theme, score = storage.find_best_theme_match(['Python', 'Flask', 'numpy'], user.id)
+    assert theme is web
+    assert score == pytest.approx(2 / 3)
+    assert storage.find_best_theme_match(['java'], user.id) is None
+
+
+def test_find_best_theme_match_tie_picks_oldest(storage, user):
+    first = add_theme(storage, user, 'First', ['python', 'flask'])
+    second = add_theme(storage, user, 'Second', ['python', 'flask'])
+    second.created_at = first.created_at + timedelta(seconds=1)
+    storage.save()
+
+    for _ in range(5):
+        assert storage.find_best_theme_match(['python', 'flask'], user.id) == (first, 1.0)
+
+
+def test_find_best_theme_match_ignores_other_users(storage, user):
+    other = User(first_name='Alan', last_name='Turing', email='alan@example.com', password='x')
+    storage.new(other)
+    storage.save()
+    add_theme(storage, other, 'Web', ['python', 'flask'])
+
+    assert storage.find_best_theme_match(['python', 'flask'], user.id) is None
@@ -0,0 +1,88 @@
+from sqlalchemy import text
+
+from Models.userModel import User
+
+
+def new_request(storage):
+    """Simule une nouvelle requête : session vide, seul le cache persiste."""
+    storage.close()
+
+
+def warm_cache(storage, user):
+    new_request(storage)
+    assert storage.get(User, user.id) is not None
+    assert storage.get_by_email(User, user.email) is not None
+    new_request(storage)
+
+
+def test_get_served_from_cache(storage, user):
+    warm_cache(storage, user)
+    with storage.count_queries() as queries:
+        assert storage.get(User, user.id).email == 'ada@example.com'
+        assert storage.get_by_email(User, 'ADA@example.com').id == user.id
+    assert queries == []
+
+
+def test_evicted_after_update(storage, user):
+    warm_cache(storage, user)
+    cached = storage.get(User, user.id)
+    cached.first_name = 'Augusta'
+    storage.save()
+
+    new_request(storage)
+    assert storage.get(User, user.id).first_name == 'Augusta'
+    new_request(storage)
+    assert storage.get_by_email(User, user.email).first_name == 'Augusta'
+
+
+def test_evicted_after_email_change(storage, user):
+    warm_cache(storage, user)
+    cached = storage.get(User, user.id)
+    cached.email = 'augusta@example.com'
+    storage.save()
+
+    new_request(storage)
+    assert storage.get_by_email(User, 'ada@example.com') is None
+    assert storage.get_by_email(User, 'augusta@example.com').id == user.id
+
+
+def test_evicted_after_soft_delete(storage, user):
+    warm_cache(storage, user)
+    storage.delete(storage.get(User, user.id))
+    storage.save()
+
+    new_request(storage)
+    assert storage.get(User, user.id) is None
+    assert storage.get_by_email(User, user.email) is None
+
+
+def test_include_deleted_bypasses_cache(storage, user):
+    warm_cache(storage, user)
+    with storage.count_queries() as queries:
+        assert storage.get(User, user.id, include_deleted=True) is not None
+    assert len(queries) == 1
+
+    new_request(storage)
+    with storage.count_queries() as queries:
+        assert storage.get_by_email(User, user.email, include_deleted=True) is not None
+    assert len(queries) == 1
+
+
+def test_cached_user_flush_keeps_other_columns(storage, user):
+    warm_cache(storage, user)
+
+    # Modification par un autre processus : listeners non déclenchés,
+    # le cache garde l'ancienne valeur de last_name
+    storage._DBStorage__session.execute(
+        text("UPDATE users SET last_name = 'Byron' WHERE id = :id"), {'id': user.id}
+    )
+    storage.save()
+    new_request(storage)
+
+    cached = storage.get(User, user.id)
+    cached.first_name = 'Augusta'
+    storage.save()
+
+    new_request(storage)
+    row = storage.get(User, user.id, include_deleted=True)
+    assert (row.first_name, row.last_name) == ('Augusta', 'Byron')